@@ -1,13 +1,91 @@
 import argparse
-from ICSVGDesigner import ICSVGDesigner
 import pathlib
+import sys
 
-def cli():
-    app = ICSVGDesigner()
+if __name__ == "__main__" and not __package__:
+    ## Run from within the source folder (python __main__.py), so the package is not importable yet
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+def rungui(args: argparse.Namespace):
+    ## The GUI is imported here so that headless commands never import tkinter
+    from ICSVGDesigner.gui import ICSVGDesigner
+    app = ICSVGDesigner(maxfps=args.max_fps, virtualtable=args.virtual_table,
+                        historydepth=args.history_depth, historymemory=int(args.history_memory * 1024 * 1024),
+                        profile=args.profile, exportformats=args.export_format, compactsvg=args.compact_svg)
+    if args.project:
+        app.openproject(str(args.project))
     iconpath = pathlib.Path(__file__).parent / 'icon.ico'
     if iconpath.exists():
         app.iconbitmap(iconpath)
     app.mainloop()
 
+def runexport(args: argparse.Namespace)-> int:
+    from ICSVGDesigner.batch import exportall, exportlibrary
+    from ICSVGDesigner.parts import PartDefinitionError, loadpath
+
+    if args.library and args.format:
+        print("Error: --format cannot be used with --library", file=sys.stderr)
+        return 2
+    try:
+        definitions = [definition for path in args.paths for definition in loadpath(path)]
+        if args.library:
+            result = exportlibrary(definitions, args.output / args.library, incremental=args.incremental, compact=args.compact)
+            if result.skipped: print(f"{result.svgpath} is up to date")
+            else: print(f"Exported {len(definitions)} parts to {result.svgpath}")
+            return 0
+        results = exportall(definitions, args.output, jobs=args.jobs, incremental=args.incremental, formats=args.format, compact=args.compact)
+    except (PartDefinitionError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    failed = 0
+    skipped = 0
+    for result in results:
+        if result.error:
+            failed += 1
+            print(f"Failed to export {result.name}:\n\t" + result.error.replace("\n", "\n\t"), file=sys.stderr)
+        elif result.skipped:
+            skipped += 1
+        else:
+            print(f"Exported {result.name} to {result.svgpath}")
+    print(f"Exported {len(results) - failed - skipped} of {len(results)} parts" + (f" ({skipped} unchanged)" if skipped else ""))
+    return 1 if failed else 0
+
+def positiveint(value: str)-> int:
+    """ argparse type for options which must be at least 1 """
+    number = int(value)
+    if number < 1: raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+def cli(argv = None)-> int:
+    from ICSVGDesigner.export import ALTERNATEFORMATS, DEFAULTFORMATS, FORMATS
+    from ICSVGDesigner.history import DEFAULTDEPTH
+    extraformats = [format for format in FORMATS if format not in DEFAULTFORMATS and format not in ALTERNATEFORMATS]
+    parser = argparse.ArgumentParser(prog='icsvgdesigner', description="A simple GUI for creating basic SVGs of IC's")
+    parser.add_argument('--max-fps', type=float, default=None, help="Limit how often the Preview is redrawn while values are changing")
+    parser.add_argument('--virtual-table', action='store_true', help="Only create pin table rows for the pins which are visible (for parts with many pins)")
+    parser.add_argument('--project', type=pathlib.Path, default=None, help="Open this ICSVGDesigner Project")
+    parser.add_argument('--history-depth', type=int, default=DEFAULTDEPTH, help=f"Maximum number of changes which can be undone (default: {DEFAULTDEPTH})")
+    parser.add_argument('--history-memory', type=float, default=64, help="Maximum memory in MB used by the Undo History (default: 64)")
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='OUTPUT', help="Time the GUI's callbacks and count its Tcl calls, showing the results on the Preview. If OUTPUT is given the results (or cProfile stats if OUTPUT ends with .prof) are saved to it on exit")
+    parser.add_argument('--export-format', action='append', default=[], choices=extraformats, help="Check this format (kicad, json or csv) to be exported alongside the SVG and TXT. Can be given more than once")
+    parser.add_argument('--compact-svg', action='store_true', help="Check Compact SVG, so that exported SVGs are smaller")
+    subparsers = parser.add_subparsers(dest='command')
+
+    exportparser = subparsers.add_parser('export', help="Export Part Definitions without opening the GUI")
+    exportparser.add_argument('paths', nargs='+', type=pathlib.Path, help="JSON/CSV Part Definition files, or directories containing them")
+    exportparser.add_argument('-o', '--output', type=pathlib.Path, default=pathlib.Path('.'), help="Directory to write the SVG and TXT files to (default: the current directory)")
+    exportparser.add_argument('-j', '--jobs', type=positiveint, default=None, help="Number of worker processes (default: one per CPU)")
+    exportparser.add_argument('--library', type=pathlib.Path, default=None, help="Write every part as a <symbol> in this single library SVG (in the output directory) instead of one SVG per part")
+    exportparser.add_argument('-f', '--format', action='append', default=[], choices=extraformats, help="Also export each part in this format: kicad (a .kicad_sym KiCad Symbol Library), json or csv (Pin Locations). Can be given more than once")
+    exportparser.add_argument('--compact', action='store_true', help="Write Compact SVGs: the pins share a single stroke style and are written as short paths with 2 decimal places")
+    exportparser.add_argument('--incremental', action='store_true', help="Skip parts which have not changed since the last incremental export (tracked in the output directory's icsvgdesigner-manifest.json)")
+
+    args = parser.parse_args(argv)
+    if args.command == 'export':
+        return runexport(args)
+    rungui(args)
+    return 0
+
 if __name__ == "__main__":
-    cli()
\ No newline at end of file
+    sys.exit(cli())
\ No newline at end of file
@@ -0,0 +1,192 @@
+""" Headless batch export of Part Definitions
+
+Parts are exported in parallel using a process pool.
+
+Incremental exports record a hash of each part's normalized definition (and the version of the
+exporter) in a manifest in the output directory. On the next incremental export, parts whose hash
+has not changed (and whose files still exist) are skipped without being regenerated or rewritten.
+"""
+import hashlib
+import json
+import os
+import pathlib
+import typing
+
+from ICSVGDesigner import export
+from ICSVGDesigner.parts import PartDefinition, PartDefinitionError, buildstore
+
+PathLike = typing.Union[str, pathlib.Path]
+
+MANIFESTNAME = 'icsvgdesigner-manifest.json'
+## Manifest keys for libraries are prefixed with this (part names cannot contain ':')
+LIBRARYKEY = 'library:'
+
+class BatchResult(typing.NamedTuple):
+    name: str
+    svgpath: typing.Optional[pathlib.Path]
+    txtpath: typing.Optional[pathlib.Path]
+    error: typing.Optional[str] = None
+    ## True if the part was unchanged since the last incremental export, so nothing was written
+    skipped: bool = False
+
+def getsvgpath(definition: PartDefinition, outputdir: PathLike)-> pathlib.Path:
+    return pathlib.Path(outputdir) / f"{definition['name']}.svg"
+
+def exportdefinition(definition: PartDefinition, outputdir: pathlib.Path, formats: typing.Sequence[str] = (), compact: bool = False)-> typing.Tuple[pathlib.Path, pathlib.Path]:
+    """ Exports a single part to outputdir/<name>.svg (and .txt and any other formats). This is run by the worker processes """
+    store = buildstore(definition)
+    return export.exportpart(store, getsvgpath(definition, outputdir), formats, compact)
+
+def hashdefinitions(definitions: typing.Sequence[PartDefinition], formats: typing.Sequence[str] = (), compact: bool = False)-> str:
+    """ Returns a hash of the (normalized) definitions, the exporter version and the export options """
+    hashed: dict[str, typing.Any] = {'exporter': export.EXPORTVERSION, 'parts': definitions}
+    ## Options are only included when they are used so that existing manifests stay valid
+    if formats: hashed['formats'] = sorted(formats)
+    if compact: hashed['compact'] = True
+    data = json.dumps(hashed, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def loadmanifest(outputdir: PathLike)-> dict[str, str]:
+    """ Returns the hashes recorded by the last incremental export to outputdir. An unreadable manifest is ignored """
+    path = pathlib.Path(outputdir) / MANIFESTNAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    hashes = data.get('hashes') if isinstance(data, dict) else None
+    return hashes if isinstance(hashes, dict) else {}
+
+def savemanifest(outputdir: PathLike, hashes: typing.Mapping[str, str]):
+    path = pathlib.Path(outputdir) / MANIFESTNAME
+    temppath = path.with_name(path.name + '.tmp')
+    with open(temppath, 'w', encoding='utf-8', newline='\n') as f:
+        ## Sorted and indented so that the manifest diffs cleanly under version control
+        json.dump({'hashes': dict(hashes)}, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(temppath, path)
+
+def checknames(definitions: typing.Sequence[PartDefinition]):
+    """ Makes sure that no two parts would be exported to the same files """
+    seen: set[str] = set()
+    for definition in definitions:
+        ## Case-insensitive since not all filesystems are case-sensitive
+        name = definition['name'].lower()
+        if name in seen:
+            raise PartDefinitionError(f"More than one part is named {definition['name']!r}")
+        seen.add(name)
+
+def _exportdefinitions(definitions: typing.Sequence[PartDefinition], outputdir: pathlib.Path, jobs: typing.Optional[int], formats: typing.Sequence[str], compact: bool, progress: typing.Callable[[], None])-> list[BatchResult]:
+    results: list[BatchResult] = []
+    if jobs == 1 or len(definitions) <= 1:
+        for definition in definitions:
+            try:
+                (svgpath, txtpath) = exportdefinition(definition, outputdir, formats, compact)
+                results.append(BatchResult(definition['name'], svgpath, txtpath))
+            except (ValueError, OSError) as e:
+                results.append(BatchResult(definition['name'], None, None, str(e)))
+            progress()
+        return results
+
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(exportdefinition, definition, outputdir, formats, compact) for definition in definitions]
+        for (definition, future) in zip(definitions, futures):
+            try:
+                (svgpath, txtpath) = future.result()
+                results.append(BatchResult(definition['name'], svgpath, txtpath))
+            except (ValueError, OSError) as e:
+                results.append(BatchResult(definition['name'], None, None, str(e)))
+            progress()
+    return results
+
+def exportall(definitions: typing.Sequence[PartDefinition], outputdir: PathLike, jobs: typing.Optional[int] = None, incremental: bool = False, formats: typing.Sequence[str] = (), compact: bool = False, progress: typing.Optional[export.ProgressCallback] = None)-> list[BatchResult]:
+    """ Exports every part to outputdir and returns the results in the same order as definitions
+
+        jobs is the number of worker processes to use (defaults to one per CPU). If jobs is 1 (or
+        only one part needs to be exported) the parts are exported in the current process. A part
+        which fails to export does not stop the others from being exported: its error is recorded
+        in its BatchResult instead.
+
+        If incremental is True, parts which have not changed since the last incremental export to
+        outputdir are skipped.
+
+        formats are the names of any formats (see export.FORMATS) to export in addition to the SVG and
+        TXT. If compact is True, Compact SVGs are exported.
+
+        progress (if provided) is called with the number of parts which have been exported (or
+        skipped, or have failed) and the total number of parts each time a part is finished.
+    """
+    formats = list(dict.fromkeys(formats))
+    export.checkformats(formats)
+    checknames(definitions)
+    outputdir = pathlib.Path(outputdir)
+    outputdir.mkdir(parents=True, exist_ok=True)
+
+    manifest = loadmanifest(outputdir) if incremental else {}
+    hashes: dict[str, str] = {}
+    results: list[typing.Optional[BatchResult]] = [None] * len(definitions)
+    pending: list[int] = []
+    for (i, definition) in enumerate(definitions):
+        if incremental:
+            name = definition['name']
+            hashes[name] = hashdefinitions([definition], formats, compact)
+            svgpath = getsvgpath(definition, outputdir)
+            txtpath = export.gettxtpath(svgpath)
+            if manifest.get(name) == hashes[name] and all(export.getformatpath(svgpath, format).exists() for format in export.DEFAULTFORMATS + tuple(formats)):
+                results[i] = BatchResult(name, svgpath, txtpath, skipped=True)
+                continue
+        pending.append(i)
+
+    finished = len(definitions) - len(pending)
+    def partfinished():
+        nonlocal finished
+        finished += 1
+        if progress: progress(finished, len(definitions))
+    ## Skipped parts are reported all at once
+    if finished and progress: progress(finished, len(definitions))
+
+    for (i, result) in zip(pending, _exportdefinitions([definitions[i] for i in pending], outputdir, jobs, formats, compact, partfinished)):
+        results[i] = result
+
+    if incremental:
+        ## Parts from earlier exports which were not part of this one are kept in the manifest
+        updated = dict(manifest)
+        for i in pending:
+            result = results[i]
+            if result.error: updated.pop(result.name, None)
+            else: updated[result.name] = hashes[result.name]
+        if updated != manifest: savemanifest(outputdir, updated)
+    return typing.cast(list[BatchResult], results)
+
+def exportlibrary(definitions: typing.Sequence[PartDefinition], svgpath: PathLike, incremental: bool = False, compact: bool = False)-> BatchResult:
+    """ Exports every part into a single library SVG (and TXT)
+
+        The parts are checked before anything is written, and each part's PinStore is only built
+        as it is written so that only one part is in memory at a time.
+
+        If incremental is True and none of the parts have changed since the library was last
+        exported incrementally, nothing is written. If compact is True, the library is a Compact SVG.
+    """
+    checknames(definitions)
+    for definition in definitions:
+        numbers = [pindef['number'] for pindef in definition['pins'] if pindef['number'] is not None]
+        if len(numbers) != len(set(numbers)):
+            raise PartDefinitionError(f"{definition['name']}: pin numbers must be unique")
+    svgpath = pathlib.Path(svgpath)
+    txtpath = export.gettxtpath(svgpath)
+    svgpath.parent.mkdir(parents=True, exist_ok=True)
+
+    if incremental:
+        manifest = loadmanifest(svgpath.parent)
+        key = LIBRARYKEY + svgpath.name
+        libraryhash = hashdefinitions(definitions, compact=compact)
+        if manifest.get(key) == libraryhash and svgpath.exists() and txtpath.exists():
+            return BatchResult(svgpath.stem, svgpath, txtpath, skipped=True)
+
+    export.exportlibrary(((definition['name'], buildstore(definition)) for definition in definitions), svgpath, compact)
+
+    if incremental:
+        manifest[key] = libraryhash
+        savemanifest(svgpath.parent, manifest)
+    return BatchResult(svgpath.stem, svgpath, txtpath)
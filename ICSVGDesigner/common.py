@@ -0,0 +1,25 @@
+""" Shared constants and types for ICSVGDesigner """
+import enum
+import typing
+
+PINLENGTH = 15
+LINETHICKNESS = 2
+CANVASSIZE = 500
+
+IID = str
+PinID = int
+class Side(enum.Enum):
+    Top = 'top'
+    Bottom = 'bottom'
+    Left = 'left'
+    Right = 'right'
+
+def getpiniid(side: Side, pinid: PinID)-> IID:
+    return f"{side.value}Pin{pinid}"
+
+def getpinsideandid(iid: IID)-> typing.Tuple[Side, PinID]:
+    result=iid.split('Pin')
+    if len(result) != 2:
+        raise ValueError(f"Invalid Pin ID {iid}")
+    (side, pinid) = result
+    return Side(side), int(result[1])
@@ -0,0 +1,569 @@
+""" SVG, Pin Location, KiCad, JSON and CSV exports for ICSVGDesigner
+
+A part's geometry (the layout of every side and the labels of every exported pin) is computed
+once as a PartGeometry, which is then passed to the writer of each format in FORMATS. The
+PartGeometry does not refer back to the PinStore, so when more than one format is exported the
+writers run concurrently, and an ExportJob can write it in a background thread while the store
+goes on changing. Other formats can be added to FORMATS.
+
+Exports are streamed: each element, coordinate line or row is written to its file as soon as it
+is generated, so memory use does not grow with the number of parts in a library. Every file is
+written to a temporary file first, and the temporary files only replace the exported files once
+all of them have been written. If replacing any of them fails, the files which were already
+replaced are restored, so a failed or cancelled export never leaves a partial set of files.
+"""
+import math
+import os
+import pathlib
+import threading
+import typing
+
+from ICSVGDesigner.common import PINLENGTH, PinID, Side
+from ICSVGDesigner import geometry
+from ICSVGDesigner.model import Pin, PinNumber, PinStore
+
+PathLike = typing.Union[str, pathlib.Path]
+Attributes = typing.Dict[str, str]
+
+## Bump whenever the contents of the exported files change, so incremental exports regenerate every part
+EXPORTVERSION = 3
+
+XMLDECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SVGNAMESPACE = 'http://www.w3.org/2000/svg'
+
+## The number of decimal places coordinates are written with in Compact SVGs
+COMPACTPRECISION = 2
+
+PINTABLEFORMAT = 'ICSVGDesigner Pin Locations'
+PINTABLEVERSION = 1
+## The columns of the CSV Pin Locations (and the keys of each pin in the JSON Pin Locations)
+PINTABLEFIELDS = ('side', 'id', 'name', 'number', 'x', 'y', 'center_x', 'center_y')
+
+KICADVERSION = 20211014
+## KiCad symbols are in millimeters: SVG user units are treated as CSS pixels (96 per inch) so the symbol is the same size as the SVG
+KICADSCALE = 25.4 / 96
+## KiCad's pin grid in millimeters: wires only connect to pins which are on it
+KICADGRID = 1.27
+KICADFONT = '(effects (font (size 1.27 1.27)))'
+## The direction each side's pins point in (from their free end towards the body)
+KICADANGLES = {Side.Top: 270, Side.Bottom: 90, Side.Left: 0, Side.Right: 180}
+
+## The same escapes xml.etree.ElementTree uses for attribute values
+_ATTRIBUTEESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', '\r': '&#13;', '\n': '&#10;', '\t': '&#09;'})
+
+class ExportCancelled(Exception):
+    """ Raised when an export is cancelled (nothing is written) """
+
+class DuplicatePinNumbersError(ValueError):
+    """ Raised when attempting to export a design in which more than one pin shares a pin number """
+    def __init__(self, messages: list[str]):
+        super().__init__("\n".join(messages))
+        self.messages = messages
+
+    def __reduce__(self):
+        ## Allows the error to be passed back from worker processes
+        return type(self), (self.messages,)
+
+def getduplicatemessages(store: PinStore)-> list[str]:
+    """ Returns a description of each pin number which is used by more than one pin """
+    output: list[str] = []
+    ## The store keeps track of its duplicates, so a design without any does not need to be scanned
+    if not store.hasduplicates(): return output
+    for (pinnumber, pins) in store.duplicatenumbers().items():
+        output.append(f"Pin Number {pinnumber} is used by {', '.join(pin.name for pin in pins)}")
+    return output
+
+def checkduplicates(store: PinStore):
+    duplicates = getduplicatemessages(store)
+    if duplicates:
+        raise DuplicatePinNumbersError(duplicates)
+
+def gettxtpath(svgpath: PathLike)-> pathlib.Path:
+    """ The Pin Locations are saved alongside the SVG """
+    return pathlib.Path(svgpath).with_suffix('.txt')
+
+def opensvg(path: PathLike)-> typing.TextIO:
+    ## Non-ascii characters are written as character references (the same as xml.etree.ElementTree)
+    return open(path, 'w', encoding='ascii', errors='xmlcharrefreplace', newline='\n')
+
+class SVGWriter:
+    """ Writes SVG (XML) elements straight to a file """
+    def __init__(self, f: typing.TextIO):
+        self.f = f
+
+    @staticmethod
+    def formatattributes(attributes: Attributes)-> str:
+        return "".join(f' {key}="{value.translate(_ATTRIBUTEESCAPES)}"' for (key, value) in attributes.items())
+
+    def declaration(self):
+        self.f.write(XMLDECLARATION)
+
+    def start(self, tag: str, attributes: Attributes):
+        self.f.write(f"<{tag}{self.formatattributes(attributes)}>")
+
+    def element(self, tag: str, attributes: Attributes):
+        """ Writes an element without any children """
+        self.f.write(f"<{tag}{self.formatattributes(attributes)} />")
+
+    def end(self, tag: str):
+        self.f.write(f"</{tag}>")
+
+def getpinlabels(pin: Pin)-> typing.Tuple[str, str, str]:
+    """ Returns the pin's (name, pin number string, name string) as used by the exports """
+    side = pin.side
+    name = pin.name
+    namestring = ""
+    if name: namestring= f" ({name})"
+    else: name = f"{side.name} Pin {pin.id + 1}"
+    pinnumber = pin.number
+    if not pinnumber:
+        pinnumber = pin.id + 1
+        pinnumberstring = f"{side.name} Pin {pinnumber}"
+    else:
+        pinnumberstring = f"Pin {pinnumber}"
+    return name, pinnumberstring, namestring
+
+def getpinpoints(sidelayout: geometry.SideLayout)-> typing.Tuple[geometry.Coordinates, geometry.Coordinates, geometry.Coordinates, geometry.Coordinates]:
+    """ Returns the (x, y, endx, endy) arrays for the side, where (x, y) is the exported Pin Location """
+    ## X and Y should be the end of the pin
+    ## NOTE- Bottom Pins have always been reported (and drawn) from the body instead
+    if sidelayout.side == Side.Bottom:
+        return sidelayout.x1, sidelayout.y1, sidelayout.x2, sidelayout.y2
+    return sidelayout.x2, sidelayout.y2, sidelayout.x1, sidelayout.y1
+
+class ExportPin(typing.NamedTuple):
+    """ An exported (not suppressed) pin and its labels (see getpinlabels) """
+    side: Side
+    id: PinID
+    name: str
+    number: PinNumber
+    label: str
+    pinnumberstring: str
+    namestring: str
+
+class PartGeometry(typing.NamedTuple):
+    """ Everything the writers need to export a part. It is built once per part and shared by every writer """
+    name: str
+    width: int
+    height: int
+    ## The layout of each side from the Top-Left and from the Center
+    topleft: typing.Dict[Side, geometry.SideLayout]
+    center: typing.Dict[Side, geometry.SideLayout]
+    ## The pins of each side which are exported, in id order
+    pins: typing.Dict[Side, typing.Tuple[ExportPin, ...]]
+
+def getpartgeometry(store: PinStore, name: str = "")-> PartGeometry:
+    """ Lays out the store's pins. The result is independent of the store, which can go on changing """
+    pincounts = store.pincounts()
+    pins: typing.Dict[Side, typing.Tuple[ExportPin, ...]] = {}
+    for side in Side.__members__.values():
+        pins[side] = tuple([ExportPin(side, pin.id, pin.name, pin.number, *getpinlabels(pin)) for pin in store.sides[side] if not pin.suppressed])
+    return PartGeometry(name, store.width, store.height,
+                        geometry.layout(store.width, store.height, pincounts, geometry.Origin.TopLeft).sides,
+                        geometry.layout(store.width, store.height, pincounts, geometry.Origin.Center).sides,
+                        pins)
+
+def writesymbol(writer: SVGWriter, part: PartGeometry, idprefix: str = ""):
+    """ Writes the body and pins of the part. Each pin's id is its name (prefixed with idprefix) """
+    writer.element('rect', {'x': str(PINLENGTH), 'y': str(PINLENGTH), 'width': str(part.width), 'height': str(part.height), 'stroke': "black", 'fill': "none", 'stroke-width': "1"})
+
+    for side in Side.__members__.values():
+        (xs, ys, endxs, endys) = getpinpoints(part.topleft[side])
+        for pin in part.pins[side]:
+            i = pin.id
+            writer.element('line', {'id': f"{idprefix}{pin.label}", 'x1': str(xs[i]), 'y1': str(ys[i]), 'x2': str(endxs[i]), 'y2': str(endys[i]), 'stroke': "black", 'stroke-width': "1"})
+
+def writelocations(f: typing.TextIO, part: PartGeometry):
+    """ Writes the Pin Locations from the Top-Left followed by the Pin Locations from the Center """
+    for (i, (title, layouts)) in enumerate([("Pin Locations from Top-Left:", part.topleft), ("Pin Locations from Center:", part.center)]):
+        if i: f.write("\n\n")
+        f.write(title)
+        for side in Side.__members__.values():
+            f.write(f"\n\t{side.name} Pins:")
+            (xs, ys, _, _) = getpinpoints(layouts[side])
+            for pin in part.pins[side]:
+                f.write(f"\n\t\t{pin.pinnumberstring}{pin.namestring}: ({xs[pin.id]}, {ys[pin.id]})")
+
+def formatnumber(value: float, precision: int)-> str:
+    """ Rounds value to precision decimal places, without any trailing zeros """
+    text = f"{value:.{precision}f}"
+    ## Only the fractional part has trailing zeros to remove
+    if '.' in text: text = text.rstrip('0').rstrip('.')
+    return '0' if text in ('-0', '') else text
+
+def writecompactsymbol(writer: SVGWriter, part: PartGeometry, idprefix: str = ""):
+    """ Writes the same symbol as writesymbol() with less markup
+
+        The stroke is set once on a group containing the body and pins, each pin is a path from
+        its Pin Location drawn with a single relative move (keeping the pin's id), and coordinates
+        are rounded to COMPACTPRECISION decimal places.
+    """
+    writer.start('g', {'stroke': "black", 'stroke-width': "1", 'fill': "none"})
+    writer.element('rect', {'x': str(PINLENGTH), 'y': str(PINLENGTH), 'width': str(part.width), 'height': str(part.height)})
+    for side in Side.__members__.values():
+        (xs, ys, endxs, endys) = getpinpoints(part.topleft[side])
+        ## Top and Bottom pins are vertical, Left and Right pins are horizontal
+        vertical = side in (Side.Top, Side.Bottom)
+        for pin in part.pins[side]:
+            i = pin.id
+            move = f"v{formatnumber(endys[i] - ys[i], COMPACTPRECISION)}" if vertical else f"h{formatnumber(endxs[i] - xs[i], COMPACTPRECISION)}"
+            writer.element('path', {'id': f"{idprefix}{pin.label}", 'd': f"M{formatnumber(xs[i], COMPACTPRECISION)} {formatnumber(ys[i], COMPACTPRECISION)}{move}"})
+    writer.end('g')
+
+def _writesvg(f: typing.TextIO, part: PartGeometry, symbolwriter: typing.Callable[[SVGWriter, PartGeometry], None]):
+    overallwidth, overallheight = geometry.overallsize(part.width, part.height)
+    writer = SVGWriter(f)
+    writer.declaration()
+    writer.start('svg', {'xmlns': SVGNAMESPACE, 'version': '1.1', 'width': str(overallwidth), 'height': str(overallheight), 'viewBox': f"0 0 {overallwidth} {overallheight}"})
+    symbolwriter(writer, part)
+    writer.end('svg')
+
+def writesvg(f: typing.TextIO, part: PartGeometry):
+    _writesvg(f, part, writesymbol)
+
+def writecompactsvg(f: typing.TextIO, part: PartGeometry):
+    _writesvg(f, part, writecompactsymbol)
+
+def iterpinrecords(part: PartGeometry)-> typing.Iterator[typing.Dict[str, typing.Any]]:
+    """ Yields each exported pin with its PINTABLEFIELDS
+
+        The coordinates are the free end of every pin. Unlike the TXT Pin Locations (see getpinpoints)
+        this includes the Bottom pins.
+    """
+    for side in Side.__members__.values():
+        (xs, ys) = (part.topleft[side].x2, part.topleft[side].y2)
+        (cxs, cys) = (part.center[side].x2, part.center[side].y2)
+        for pin in part.pins[side]:
+            i = pin.id
+            yield {'side': side.value, 'id': i, 'name': pin.name, 'number': pin.number,
+                   'x': xs[i], 'y': ys[i], 'center_x': cxs[i], 'center_y': cys[i]}
+
+def writejson(f: typing.TextIO, part: PartGeometry):
+    """ Writes the Pin Locations as JSON, one pin per line """
+    import json
+    overallwidth, overallheight = geometry.overallsize(part.width, part.height)
+    header = {'format': PINTABLEFORMAT, 'version': PINTABLEVERSION, 'name': part.name, 'width': part.width, 'height': part.height,
+              'overallwidth': overallwidth, 'overallheight': overallheight}
+    f.write("{" + ", ".join(f"{json.dumps(key)}: {json.dumps(value)}" for (key, value) in header.items()) + ', "pins": [')
+    for (i, record) in enumerate(iterpinrecords(part)):
+        f.write(("," if i else "") + "\n" + json.dumps(record))
+    f.write("\n]}\n")
+
+def writecsv(f: typing.TextIO, part: PartGeometry):
+    """ Writes the Pin Locations as CSV, one row per pin. Pins without a pin number have an empty number """
+    import csv
+    writer = csv.writer(f)
+    writer.writerow(PINTABLEFIELDS)
+    for record in iterpinrecords(part):
+        writer.writerow(['' if record[field] is None else record[field] for field in PINTABLEFIELDS])
+
+def kicadstring(value: str)-> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+def kicadgrid(value: float)-> int:
+    """ Converts value from SVG user units to the nearest whole number of KICADGRID steps """
+    return round(value * KICADSCALE / KICADGRID)
+
+def kicadnumber(steps: int)-> str:
+    """ Converts a number of KICADGRID steps to millimeters """
+    return formatnumber(steps * KICADGRID, 4)
+
+def kicadpinpositions(pins: int, length: float)-> typing.Tuple[int, ...]:
+    """ Returns the position of each pin along a side of the given length (in SVG user units)
+
+        Positions are in KICADGRID steps from the middle of the side, in id order. The pins are
+        spaced as close to the SVG's spacing as the grid allows (but never closer than one step).
+    """
+    pitch = max(1, kicadgrid(length / (pins + 1)))
+    start = -((pins - 1) * pitch // 2)
+    return tuple([start + i * pitch for i in range(pins)])
+
+def kicadhalfsize(length: float, pinpositions: typing.Sequence[int])-> int:
+    """ Returns half of the body's length along a side in KICADGRID steps, so that it contains all of the side's pins """
+    ## Rounded first so that floating point error does not add a step
+    steps = math.ceil(round(length / 2 * KICADSCALE / KICADGRID, 6))
+    return max(steps, 1, *(abs(position) + 1 for position in pinpositions))
+
+def writekicad(f: typing.TextIO, part: PartGeometry):
+    """ Writes the part as a single symbol in a KiCad (6+) Symbol Library
+
+        The symbol is centered on the body and every pin is placed on KiCad's 1.27mm grid so that
+        wires connect to it. Pins keep their order and (as nearly as the grid allows) their spacing,
+        and the body is made large enough to fit them, so the symbol can be slightly larger than
+        the SVG. Each pin is placed at its free end; pins without a pin number are numbered by
+        their side and position (e.g.- "L3" for the third Left pin) since KiCad pins need one.
+    """
+    name = kicadstring(part.name)
+    pincounts = {side: len(part.topleft[side].x1) for side in Side.__members__.values()}
+    positions = {side: kicadpinpositions(pincounts[side], part.width if side in (Side.Top, Side.Bottom) else part.height)
+                 for side in Side.__members__.values()}
+    halfwidth = kicadhalfsize(part.width, positions[Side.Top] + positions[Side.Bottom])
+    halfheight = kicadhalfsize(part.height, positions[Side.Left] + positions[Side.Right])
+    pinlength = max(1, kicadgrid(PINLENGTH))
+    labely = halfheight + pinlength + 1
+    f.write(f"(kicad_symbol_lib (version {KICADVERSION}) (generator icsvgdesigner)\n")
+    f.write(f"  (symbol {name} (in_bom yes) (on_board yes)\n")
+    f.write(f"    (property \"Reference\" \"U\" (id 0) (at 0 {kicadnumber(labely)} 0)\n      {KICADFONT}\n    )\n")
+    f.write(f"    (property \"Value\" {name} (id 1) (at 0 {kicadnumber(-labely)} 0)\n      {KICADFONT}\n    )\n")
+    f.write(f"    (symbol {kicadstring(part.name + '_0_1')}\n")
+    f.write(f"      (rectangle (start {kicadnumber(-halfwidth)} {kicadnumber(halfheight)}) (end {kicadnumber(halfwidth)} {kicadnumber(-halfheight)})\n")
+    f.write("        (stroke (width 0) (type default) (color 0 0 0 0))\n        (fill (type background))\n      )\n    )\n")
+    f.write(f"    (symbol {kicadstring(part.name + '_1_1')}\n")
+    ## KiCad's y-axis points up, so Top pins have the largest y and pin ids increase downwards on the Left and Right
+    ends = {Side.Top: lambda i: (positions[Side.Top][i], halfheight + pinlength),
+            Side.Bottom: lambda i: (positions[Side.Bottom][i], -halfheight - pinlength),
+            Side.Left: lambda i: (-halfwidth - pinlength, -positions[Side.Left][i]),
+            Side.Right: lambda i: (halfwidth + pinlength, -positions[Side.Right][i])}
+    for side in Side.__members__.values():
+        for pin in part.pins[side]:
+            i = pin.id
+            (x, y) = ends[side](i)
+            number = str(pin.number) if pin.number is not None else f"{side.name[0]}{i + 1}"
+            f.write(f"      (pin passive line (at {kicadnumber(x)} {kicadnumber(y)} {KICADANGLES[side]}) (length {kicadnumber(pinlength)})\n")
+            f.write(f"        (name {kicadstring(pin.name)} {KICADFONT})\n        (number {kicadstring(number)} {KICADFONT})\n      )\n")
+    f.write("    )\n  )\n)\n")
+
+def opentxt(path: PathLike)-> typing.TextIO:
+    return open(path, 'w')
+
+def openutf8(path: PathLike)-> typing.TextIO:
+    return open(path, 'w', encoding='utf-8', newline='\n')
+
+def opencsv(path: PathLike)-> typing.TextIO:
+    ## The csv module writes its own line endings
+    return open(path, 'w', encoding='utf-8', newline='')
+
+class ExportFormat(typing.NamedTuple):
+    suffix: str
+    description: str
+    write: typing.Callable[[typing.TextIO, PartGeometry], None]
+    open: typing.Callable[[PathLike], typing.TextIO]
+
+## Export formats by name. Every format is written alongside the SVG, with the format's suffix
+FORMATS: typing.Dict[str, ExportFormat] = {
+    'svg': ExportFormat('.svg', "SVG", writesvg, opensvg),
+    'compactsvg': ExportFormat('.svg', "Compact SVG", writecompactsvg, opensvg),
+    'txt': ExportFormat('.txt', "Pin Locations", writelocations, opentxt),
+    'kicad': ExportFormat('.kicad_sym', "KiCad Symbol Library", writekicad, openutf8),
+    'json': ExportFormat('.json', "JSON Pin Locations", writejson, openutf8),
+    'csv': ExportFormat('.csv', "CSV Pin Locations", writecsv, opencsv),
+}
+## The formats which are always exported
+DEFAULTFORMATS = ('svg', 'txt')
+## Formats which replace one of the DEFAULTFORMATS
+ALTERNATEFORMATS = {'compactsvg': 'svg'}
+
+def getsvgformat(compact: bool = False)-> str:
+    return 'compactsvg' if compact else 'svg'
+
+def getformatpath(path: PathLike, format: str)-> pathlib.Path:
+    return pathlib.Path(path).with_suffix(FORMATS[format].suffix)
+
+def checkformats(formats: typing.Iterable[str]):
+    for format in formats:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format {format!r} (expected one of {', '.join(FORMATS)})")
+
+def gettemppath(path: pathlib.Path)-> pathlib.Path:
+    return path.with_name(path.name + '.tmp')
+
+def getbackuppath(path: pathlib.Path)-> pathlib.Path:
+    return path.with_name(path.name + '.bak')
+
+def removetemppaths(temppaths: typing.Iterable[pathlib.Path]):
+    for temppath in temppaths:
+        try:
+            temppath.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+def commitfiles(files: typing.Mapping[pathlib.Path, pathlib.Path]):
+    """ Replaces each path in files with its temporary file
+
+        Existing files are moved aside first. If any file cannot be replaced, every file is put back
+        the way it was (and the temporary files are removed), so either all of the files are updated
+        or none of them are.
+    """
+    backups: dict[pathlib.Path, pathlib.Path] = {}
+    replaced: list[pathlib.Path] = []
+    try:
+        for (path, temppath) in files.items():
+            if path.exists():
+                backups[path] = getbackuppath(path)
+                os.replace(path, backups[path])
+            os.replace(temppath, path)
+            replaced.append(path)
+    except BaseException:
+        for path in replaced:
+            if path not in backups: removetemppaths([path])
+        for (path, backup) in backups.items():
+            try:
+                os.replace(backup, path)
+            except OSError:
+                pass
+        removetemppaths(files.values())
+        raise
+    removetemppaths(backups.values())
+
+class CancellableFile:
+    """ Passes writes through to a file until the export is cancelled, at which point ExportCancelled is raised """
+    def __init__(self, f: typing.TextIO, cancelled: threading.Event):
+        self.f = f
+        self.cancelled = cancelled
+
+    def write(self, text: str)-> int:
+        if self.cancelled.is_set(): raise ExportCancelled()
+        return self.f.write(text)
+
+def writeformat(part: PartGeometry, format: str, path: pathlib.Path, cancelled: typing.Optional[threading.Event] = None):
+    exportformat = FORMATS[format]
+    with exportformat.open(path) as f:
+        exportformat.write(f if cancelled is None else typing.cast(typing.TextIO, CancellableFile(f, cancelled)), part)
+
+## Called with the number of parts which have been exported and the total number of parts
+ProgressCallback = typing.Callable[[int, int], None]
+
+def writeformats(part: PartGeometry, paths: typing.Mapping[str, pathlib.Path], cancelled: typing.Optional[threading.Event] = None):
+    """ Writes the part in each format to its path
+
+        Each format is written to a temporary file, and the temporary files only replace the files
+        at paths (see commitfiles) once every format has been written. When more than one format is
+        written, the writers are run concurrently. If cancelled is set while the files are being
+        written, ExportCancelled is raised.
+    """
+    temppaths = {format: gettemppath(path) for (format, path) in paths.items()}
+    try:
+        if len(paths) <= 1:
+            for (format, temppath) in temppaths.items():
+                writeformat(part, format, temppath, cancelled)
+        else:
+            import concurrent.futures
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(paths)) as executor:
+                futures = [executor.submit(writeformat, part, format, temppath, cancelled) for (format, temppath) in temppaths.items()]
+                ## Every writer has to finish before its temporary file can be removed
+                for future in futures:
+                    future.result()
+        if cancelled is not None and cancelled.is_set(): raise ExportCancelled()
+    except BaseException:
+        removetemppaths(temppaths.values())
+        raise
+    commitfiles({path: temppaths[format] for (format, path) in paths.items()})
+
+def getexportpaths(path: PathLike, formats: typing.Iterable[str])-> typing.Dict[str, pathlib.Path]:
+    """ Returns the path of each format (checking that they are all valid formats) """
+    formats = list(dict.fromkeys(formats))
+    checkformats(formats)
+    suffixes = [FORMATS[format].suffix for format in formats]
+    if len(set(suffixes)) != len(suffixes):
+        raise ValueError(f"More than one of the formats {', '.join(formats)} would be written to the same file")
+    ## The SVG is written to path itself, even if it has a different suffix
+    return {format: pathlib.Path(path) if FORMATS[format].suffix == '.svg' else getformatpath(path, format) for format in formats}
+
+def exportformats(store: PinStore, path: PathLike, formats: typing.Iterable[str] = DEFAULTFORMATS, name: typing.Optional[str] = None)-> typing.Dict[str, pathlib.Path]:
+    """ Writes the design in each of the formats, to path with each format's suffix
+
+        The design is laid out once and each format is written from that layout (see writeformats).
+        name is the name of the part (used by the KiCad and JSON exports) and defaults to the file name.
+
+        Raises DuplicatePinNumbersError (without writing anything) if any pin numbers are used more than once.
+        Returns the path written for each format.
+    """
+    paths = getexportpaths(path, formats)
+    checkduplicates(store)
+    path = pathlib.Path(path)
+    writeformats(getpartgeometry(store, path.stem if name is None else name), paths)
+    return paths
+
+class ExportJob:
+    """ Writes a part in a background thread
+
+        The part is laid out (and checked for duplicate pin numbers) when the job is created, so
+        the store can go on changing while it is written. done and total are the number of parts
+        exported so far and in total: a part only counts once all of its files have replaced the
+        exported files. Once finished is set, error holds the exception the export raised
+        (ExportCancelled if it was cancelled), if any.
+    """
+    def __init__(self, store: PinStore, path: PathLike, formats: typing.Iterable[str] = DEFAULTFORMATS, name: typing.Optional[str] = None):
+        self.paths = getexportpaths(path, formats)
+        checkduplicates(store)
+        path = pathlib.Path(path)
+        self.part = getpartgeometry(store, path.stem if name is None else name)
+        self.done = 0
+        self.total = 1
+        self.error: typing.Optional[BaseException] = None
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='ICSVGDesigner export', daemon=True)
+
+    def start(self)-> "ExportJob":
+        self.thread.start()
+        return self
+
+    def run(self):
+        try:
+            writeformats(self.part, self.paths, self.cancelled)
+            self.done = 1
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.finished.set()
+
+    def cancel(self):
+        """ Stops the export as soon as possible. Nothing is written unless every file had already been written """
+        self.cancelled.set()
+
+    def wait(self, timeout: typing.Optional[float] = None)-> bool:
+        """ Waits for the export to finish. Returns True if it has finished """
+        return self.finished.wait(timeout)
+
+def exportpart(store: PinStore, svgpath: PathLike, extraformats: typing.Iterable[str] = (), compact: bool = False)-> typing.Tuple[pathlib.Path, pathlib.Path]:
+    """ Writes the design's SVG to svgpath and its Pin Locations alongside it
+
+        Any extraformats (see FORMATS) are also written alongside the SVG. If compact is True a
+        Compact SVG is written instead (see writecompactsymbol).
+        Raises DuplicatePinNumbersError (without writing anything) if any pin numbers are used more than once.
+        Returns the paths of the SVG and TXT files.
+    """
+    svgformat = getsvgformat(compact)
+    paths = exportformats(store, svgpath, (svgformat, 'txt') + tuple(extraformats))
+    return paths[svgformat], paths['txt']
+
+def exportlibrary(parts: typing.Iterable[typing.Tuple[str, PinStore]], svgpath: PathLike, compact: bool = False)-> typing.Tuple[pathlib.Path, pathlib.Path]:
+    """ Writes every part into a single library SVG (with the Pin Locations of every part alongside it)
+
+        Each part is written as a <symbol> whose id is the part's name and whose pins' ids are
+        prefixed with "<part name>-". parts may be a generator, in which case only one part needs
+        to be in memory at a time.
+
+        If compact is True each symbol is written in the same way as a Compact SVG (see writecompactsymbol).
+        Parts with duplicate pin numbers raise DuplicatePinNumbersError, in which case neither file is written.
+        Returns the paths of the SVG and TXT files.
+    """
+    svgpath = pathlib.Path(svgpath)
+    txtpath = gettxtpath(svgpath)
+    temppaths = (gettemppath(svgpath), gettemppath(txtpath))
+    try:
+        writelibrary(parts, *temppaths, writecompactsymbol if compact else writesymbol)
+    except BaseException:
+        removetemppaths(temppaths)
+        raise
+    commitfiles({svgpath: temppaths[0], txtpath: temppaths[1]})
+    return svgpath, txtpath
+
+def writelibrary(parts: typing.Iterable[typing.Tuple[str, PinStore]], svgpath: pathlib.Path, txtpath: pathlib.Path, symbolwriter: typing.Callable[..., None] = writesymbol):
+    with opensvg(svgpath) as svgfile, opentxt(txtpath) as txtfile:
+        writer = SVGWriter(svgfile)
+        writer.declaration()
+        writer.start('svg', {'xmlns': SVGNAMESPACE, 'version': '1.1'})
+        for (i, (name, store)) in enumerate(parts):
+            checkduplicates(store)
+            part = getpartgeometry(store, name)
+            overallwidth, overallheight = geometry.overallsize(part.width, part.height)
+            writer.start('symbol', {'id': name, 'viewBox': f"0 0 {overallwidth} {overallheight}"})
+            symbolwriter(writer, part, idprefix=f"{name}-")
+            writer.end('symbol')
+
+            if i: txtfile.write("\n\n")
+            txtfile.write(f"{name}:\n")
+            writelocations(txtfile, part)
+        writer.end('svg')
@@ -0,0 +1,173 @@
+""" Pin geometry for ICSVGDesigner
+
+All pin positions (for both the Preview Canvas and Exports) are calculated here so that
+they only have to be worked out once per layout. Each side is laid out in a single pass
+and returned as parallel coordinate arrays instead of one point at a time.
+"""
+import enum
+import typing
+
+from ICSVGDesigner.common import PINLENGTH, CANVASSIZE, Side
+
+Coordinate = float
+Coordinates = typing.Tuple[Coordinate, ...]
+Rect = typing.Tuple[Coordinate, Coordinate, Coordinate, Coordinate]
+
+class Origin(enum.Enum):
+    ## Unscaled Canvas coordinates: the body is centered on a CANVASSIZE x CANVASSIZE canvas
+    Preview = 'preview'
+    ## Export coordinates: the top-left corner of the pins' bounding box is (0, 0)
+    TopLeft = 'topleft'
+    ## Export coordinates: the center of the body is (0, 0)
+    Center = 'center'
+
+class SideLayout(typing.NamedTuple):
+    """ The endpoints of every pin on a single side.
+
+        (x1[i], y1[i]) is where pin i meets the body and (x2[i], y2[i]) is the free end of the pin.
+    """
+    side: Side
+    x1: Coordinates
+    y1: Coordinates
+    x2: Coordinates
+    y2: Coordinates
+
+class Layout(typing.NamedTuple):
+    body: Rect
+    sides: typing.Dict[Side, SideLayout]
+
+def overallsize(width: int, height: int)-> typing.Tuple[int, int]:
+    """ Returns the size of the bounding box of the body and its pins """
+    return width + 2 * PINLENGTH, height + 2 * PINLENGTH
+
+def _bodyoffset(width: int, height: int, origin: Origin)-> typing.Tuple[Coordinate, Coordinate]:
+    if origin == Origin.Preview:
+        return (CANVASSIZE - width) / 2, (CANVASSIZE - height) / 2
+    if origin == Origin.TopLeft:
+        return PINLENGTH, PINLENGTH
+    if origin == Origin.Center:
+        return -width / 2, -height / 2
+    raise ValueError(f"Invalid origin {origin}")
+
+def bodyrect(width: int, height: int, origin: Origin = Origin.TopLeft)-> Rect:
+    """ Returns the (x1, y1, x2, y2) bounding box of the body """
+    xoffset, yoffset = _bodyoffset(width, height, origin)
+    return xoffset, yoffset, xoffset + width, yoffset + height
+
+def layoutside(side: Side, pins: int, width: int, height: int, origin: Origin = Origin.TopLeft)-> SideLayout:
+    """ Lays out all pins on the given side, spacing them evenly along the body """
+    pins = max(pins, 0)
+    if origin == Origin.Center:
+        ## Center coordinates are defined as an offset of the Top-Left coordinates
+        topleft = layoutside(side, pins, width, height, Origin.TopLeft)
+        overallwidth, overallheight = overallsize(width, height)
+        cx, cy = overallwidth / 2, overallheight / 2
+        return SideLayout(side,
+                          tuple([x - cx for x in topleft.x1]), tuple([y - cy for y in topleft.y1]),
+                          tuple([x - cx for x in topleft.x2]), tuple([y - cy for y in topleft.y2]))
+
+    xoffset, yoffset = _bodyoffset(width, height, origin)
+    if side in (Side.Top, Side.Bottom):
+        spacing = width / (pins + 1)
+        xs = tuple([xoffset + spacing * (i + 1) for i in range(pins)])
+        if side == Side.Top:
+            edge, end = yoffset, yoffset - PINLENGTH
+        else:
+            edge, end = yoffset + height, yoffset + height + PINLENGTH
+        return SideLayout(side, xs, (edge,) * pins, xs, (end,) * pins)
+    if side in (Side.Left, Side.Right):
+        spacing = height / (pins + 1)
+        ys = tuple([yoffset + spacing * (i + 1) for i in range(pins)])
+        if side == Side.Left:
+            edge, end = xoffset, xoffset - PINLENGTH
+        else:
+            edge, end = xoffset + width, xoffset + width + PINLENGTH
+        return SideLayout(side, (edge,) * pins, ys, (end,) * pins, ys)
+    raise ValueError(f"Invalid side {side}")
+
+def layout(width: int, height: int, pincounts: typing.Mapping[Side, int], origin: Origin = Origin.TopLeft)-> Layout:
+    """ Lays out the body and every pin on every side in one call """
+    return Layout(bodyrect(width, height, origin),
+                  {side: layoutside(side, pincounts.get(side, 0), width, height, origin) for side in Side.__members__.values()})
+
+def previewscale(width: int, height: int)-> float:
+    """ Returns the scale which fits the body, its pins and a margin of one pin length onto the Preview Canvas """
+    overallx = width + 4 * PINLENGTH
+    xscale = CANVASSIZE / overallx
+    overally = height + 4 * PINLENGTH
+    yscale = CANVASSIZE / overally
+    return min(xscale, yscale)
+
+def _scale(values: Coordinates, scale: float, origin: float)-> Coordinates:
+    return tuple([origin + scale * (value - origin) for value in values])
+
+def scalelayout(layout: Layout, scale: float, xorigin: float, yorigin: float)-> Layout:
+    """ Scales every coordinate in the layout about (xorigin, yorigin) in the same way as tk.Canvas.scale """
+    (bx1, by1, bx2, by2) = layout.body
+    body = (xorigin + scale * (bx1 - xorigin), yorigin + scale * (by1 - yorigin),
+            xorigin + scale * (bx2 - xorigin), yorigin + scale * (by2 - yorigin))
+    sides = {side: SideLayout(side,
+                              _scale(sidelayout.x1, scale, xorigin), _scale(sidelayout.y1, scale, yorigin),
+                              _scale(sidelayout.x2, scale, xorigin), _scale(sidelayout.y2, scale, yorigin))
+             for (side, sidelayout) in layout.sides.items()}
+    return Layout(body, sides)
+
+def previewlayout(width: int, height: int, pincounts: typing.Mapping[Side, int])-> Layout:
+    """ Lays out the body and pins in Canvas coordinates, scaled to fit the Preview Canvas """
+    return scalelayout(layout(width, height, pincounts, Origin.Preview), previewscale(width, height), CANVASSIZE / 2, CANVASSIZE / 2)
+
+def _transform(values: Coordinates, scale: float, offset: float)-> Coordinates:
+    return tuple([value * scale + offset for value in values])
+
+def transformlayout(layout: Layout, scale: float, dx: float, dy: float)-> Layout:
+    """ Scales every coordinate in the layout about (0, 0) and then moves it by (dx, dy) """
+    (bx1, by1, bx2, by2) = layout.body
+    body = (bx1 * scale + dx, by1 * scale + dy, bx2 * scale + dx, by2 * scale + dy)
+    sides = {side: SideLayout(side,
+                              _transform(sidelayout.x1, scale, dx), _transform(sidelayout.y1, scale, dy),
+                              _transform(sidelayout.x2, scale, dx), _transform(sidelayout.y2, scale, dy))
+             for (side, sidelayout) in layout.sides.items()}
+    return Layout(body, sides)
+
+## The Preview can be zoomed out to MINZOOM and in to MAXZOOM times its fitted size
+MINZOOM = 0.25
+MAXZOOM = 500.0
+
+class Viewport:
+    """ The zoom and pan of the Preview Canvas
+
+        A point p of the fitted Preview layout is shown at p * zoom + offset.
+    """
+    def __init__(self):
+        self.zoom = 1.0
+        self.xoffset = 0.0
+        self.yoffset = 0.0
+
+    def isidentity(self)-> bool:
+        return self.zoom == 1.0 and self.xoffset == 0.0 and self.yoffset == 0.0
+
+    def apply(self, layout: Layout)-> Layout:
+        """ Returns the layout in Canvas coordinates """
+        if self.isidentity(): return layout
+        return transformlayout(layout, self.zoom, self.xoffset, self.yoffset)
+
+    def zoomat(self, factor: float, x: Coordinate, y: Coordinate)-> float:
+        """ Zooms about the Canvas point (x, y), keeping it in place (the same as tk.Canvas.scale)
+
+            The zoom is kept between MINZOOM and MAXZOOM; returns the factor which was actually applied.
+        """
+        zoom = min(max(self.zoom * factor, MINZOOM), MAXZOOM)
+        factor = zoom / self.zoom
+        self.zoom = zoom
+        self.xoffset = x + factor * (self.xoffset - x)
+        self.yoffset = y + factor * (self.yoffset - y)
+        return factor
+
+    def pan(self, dx: Coordinate, dy: Coordinate):
+        self.xoffset += dx
+        self.yoffset += dy
+
+    def reset(self):
+        self.zoom = 1.0
+        self.xoffset = 0.0
+        self.yoffset = 0.0
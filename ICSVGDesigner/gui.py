@@ -0,0 +1,737 @@
+""" The ICSVGDesigner GUI
+
+This is the only module (along with its views: pintable and renderer) which requires tkinter.
+"""
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import typing
+
+from ICSVGDesigner.common import CANVASSIZE, IID, LINETHICKNESS, PinID, Side, getpinsideandid
+from ICSVGDesigner import geometry
+from ICSVGDesigner.export import ALTERNATEFORMATS, DEFAULTFORMATS, FORMATS, ExportCancelled, ExportJob, checkformats, exportpart, getduplicatemessages, getformatpath, getsvgformat
+from ICSVGDesigner.history import DEFAULTDEPTH, DEFAULTMEMORYLIMIT, History, RestoreResult
+from ICSVGDesigner.hittest import PinHitIndex
+from ICSVGDesigner.instrument import Instrumentation, getprofilesetting
+from ICSVGDesigner.model import MAXPINS, Pin, PinStore
+from ICSVGDesigner.parts import PartDefinitionError, applypintable, parsepintable
+from ICSVGDesigner.pintable import PinTable, TreePinTable, VirtualPinTable
+from ICSVGDesigner.project import PROJECTSUFFIX, Project, ProjectError, loadproject
+from ICSVGDesigner.renderer import CanvasRenderer
+from ICSVGDesigner.scheduler import RenderScheduler
+
+## Pins whose pin number is used by another pin are drawn in this color
+DUPLICATECOLOR = 'orange'
+## The pin under the mouse is drawn with this width
+HOVERTHICKNESS = LINETHICKNESS * 2
+## How far (in pixels) the mouse has to be dragged on the Preview to start a box selection
+DRAGTHRESHOLD = 4
+## How much each step of the mouse wheel zooms the Preview
+ZOOMSTEP = 1.25
+## The callbacks which are timed when instrumentation is enabled
+INSTRUMENTED = ['draw', 'sortTree', 'click', 'selectpin', 'showpinedit', 'setpinvalue', 'export',
+                'startselection', 'dragselection', 'endselection', 'hover', 'onwheel', 'dragpan',
+                'resetview', 'undo', 'redo', 'openproject', 'saveproject', 'importpins']
+## How often (in milliseconds) the instrumentation HUD is updated
+HUDINTERVAL = 250
+## How often (in milliseconds) the progress of a background export is checked
+EXPORTPOLL = 50
+
+class ScrolledFrame(ttk.Frame):
+    """A pure Tkinter scrollable frame that actually works!
+
+    * Use the 'interior' attribute to place widgets inside the scrollable frame
+    * Construct and pack/place/grid normally
+    * This frame only allows vertical scrolling
+    
+    """
+    def __init__(self, parent, *args, **kw):
+        super().__init__(parent, *args, **kw)
+
+        # create a canvas object and a vertical scrollbar for scrolling it
+        self.canvas = canvas = tk.Canvas(self, bd=0, highlightthickness=0)
+        canvas.pack(side='left', fill='both', expand=True)
+        vscrollbar = tk.Scrollbar(self, orient="vertical", command=canvas.yview)
+        vscrollbar.pack(side='right',fill='y')
+        canvas.configure(yscrollcommand=vscrollbar.set)
+
+        # reset the view
+        canvas.xview_moveto(0)
+        canvas.yview_moveto(0)
+
+        # create a frame inside the canvas which will be scrolled with it
+        self.interior = interior = tk.Frame(canvas)
+        interior_id = canvas.create_window(0, 0, window=interior,
+                                           anchor="nw")
+
+        # track changes to the canvas and frame width and sync them,
+        # also updating the scrollbar
+        def _configure_interior(event):
+            reqwidth, reqheight = interior.winfo_reqwidth(), interior.winfo_reqheight()
+            # update the scrollbars to match the size of the inner frame
+            canvas.config(scrollregion=(0, 0, reqwidth, reqheight))
+            if reqheight != canvas.winfo_height():
+                # update the canvas's width to fit the inner frame
+                canvas.config(height=reqheight)
+            if reqwidth != canvas.winfo_width():
+                # update the canvas's width to fit the inner frame
+                canvas.config(width=reqwidth)
+        interior.bind('<Configure>', _configure_interior)
+
+        def _configure_canvas(event):
+            width, height = canvas.winfo_width(), canvas.winfo_height()
+            if interior.winfo_reqheight() != height:
+                # update the inner frame's width to fill the canvas
+                canvas.itemconfigure(interior_id, height=height)
+            if interior.winfo_reqwidth() != width:
+                # update the inner frame's width to fill the canvas
+                canvas.itemconfigure(interior_id, width=width)
+        canvas.bind('<Configure>', _configure_canvas)
+
+class ICSVGDesigner(tk.Tk):
+    def __init__(self, maxfps: typing.Optional[float] = None, virtualtable: bool = False, historydepth: int = DEFAULTDEPTH, historymemory: int = DEFAULTMEMORYLIMIT, profile: typing.Optional[str] = None, exportformats: typing.Sequence[str] = (), compactsvg: bool = False):
+        """ Creates the Designer Window
+
+            maxfps: if provided, limits how often the Preview is redrawn while its values are changing
+            virtualtable: if True, the pin table only creates rows for the pins which are visible (for parts with many pins)
+            historydepth: the maximum number of changes which can be undone
+            historymemory: the maximum memory (in bytes) the Undo History can use
+            profile: enables instrumentation (see ICSVGDesigner.instrument); "" shows the HUD only, otherwise
+                the statistics are written to this file on close. Defaults to the ICSVGDESIGNER_PROFILE environment variable
+            exportformats: the formats (see ICSVGDesigner.export.FORMATS) which are initially checked to be exported alongside the SVG and TXT
+            compactsvg: whether Compact SVG is initially checked
+        """
+        super().__init__()
+
+        ## Callbacks have to be instrumented before they are bound to anything
+        self.instrument: typing.Optional[Instrumentation] = None
+        profile = getprofilesetting(profile)
+        if profile is not None:
+            self.instrument = Instrumentation(profile)
+            self.instrument.instrumentmethods(self, INSTRUMENTED)
+
+        self.selected: IID = ""
+        ## Once the design has been saved as a project, every edit is autosaved to the project's journal
+        self.project: typing.Optional[Project] = None
+
+        self.style = ttk.Style()
+        self.style.configure("TLabel", font=("Arial", 12, 'bold'))
+
+        self.title("ICSVGDesigner")
+
+        ## The Canvas and Treeview are both views of the PinStore
+        self.store = PinStore()
+        self.history = History(self.store, depth=historydepth, memorylimit=historymemory)
+
+        self.canvas = tk.Canvas(self, bg='white', width=CANVASSIZE, height=CANVASSIZE, scrollregion=(0, 0, CANVASSIZE, CANVASSIZE))
+        self.canvas.pack(side='left')
+        if self.instrument: self.instrument.counttcl(self.canvas, 'canvas')
+        self.renderer = CanvasRenderer(self.canvas)
+        ## Finds pins on the Preview using the layout they were drawn with
+        self.hitindex = PinHitIndex()
+        ## The layout which fits the Preview and the zoom and pan applied to it
+        self.fitlayout: typing.Optional[geometry.Layout] = None
+        self.viewport = geometry.Viewport()
+        self.panstart: typing.Optional[typing.Tuple[int, int]] = None
+        self.hovered: typing.Optional[Pin] = None
+        self.hovertext = self.canvas.create_text(4, 4, anchor='nw', text='')
+        ## The Canvas position where the mouse was pressed and the box drawn while dragging
+        self.selectionstart: typing.Optional[typing.Tuple[float, float]] = None
+        self.selectionbox: typing.Optional[int] = None
+
+        scrolledframe = ScrolledFrame(self)
+        scrolledframe.pack(side='right', fill='y')
+
+        rft = ttk.Frame(scrolledframe.interior)
+        rft.pack(side='top')
+
+        ttk.Label(rft, text='IC Width').grid(row=0, column=0, sticky='nsew')
+        self.width = tk.IntVar()
+        self.width.set(100)
+        width = ttk.Spinbox(rft, from_=100, to=1000, increment=1, textvariable=self.width)
+        width.grid(row=0, column=1, sticky='nsew')
+        ttk.Label(rft, text='IC Height').grid(row=1, column=0, sticky='nsew')
+        self.height = tk.IntVar()
+        self.height.set(100)
+        height = ttk.Spinbox(rft, from_=100, to=1000, increment=1, textvariable=self.height)
+        height.grid(row=1, column=1, sticky='nsew')
+
+        ttk.Label(rft, text="Top Pins").grid(row=2, column=0, sticky='nsew')
+        self.top_pins = tk.IntVar()
+        tp = ttk.Spinbox(rft, from_=0, to=1000, textvariable=self.top_pins)
+        tp.grid(row=2, column=1, sticky='nsew')
+        ttk.Label(rft, text="Bottom Pins").grid(row=3, column=0, sticky='nsew')
+        self.bottom_pins = tk.IntVar()
+        bp = ttk.Spinbox(rft, from_=0, to=1000, textvariable=self.bottom_pins)
+        bp.grid(row=3, column=1, sticky='nsew')
+        ttk.Label(rft, text="Left Pins").grid(row=4, column=0, sticky='nsew')
+        self.left_pins = tk.IntVar()
+        lp = ttk.Spinbox(rft, from_=0, to=1000, textvariable=self.left_pins)
+        lp.grid(row=4, column=1, sticky='nsew')
+        ttk.Label(rft, text="Right Pins").grid(row=5, column=0, sticky='nsew')
+        self.right_pins = tk.IntVar()
+        rp = ttk.Spinbox(rft, from_=0, to=1000, textvariable=self.right_pins)
+        rp.grid(row=5, column=1, sticky='nsew')
+
+        rmf = ttk.Frame(scrolledframe.interior)
+        rmf.pack(side='top', fill='both', expand=True)
+
+        pf = ttk.Frame(rmf)
+        pf.pack(side='top', fill='x', expand=True)
+
+        self.pinnameframe = ttk.Frame(pf)
+        ttk.Label(self.pinnameframe, text='Set Pin Name').pack(side='left')
+        self.pinname = tk.StringVar()
+        self.pinnameentry = ttk.Entry(self.pinnameframe, textvariable=self.pinname)
+        self.pinnameentry.pack(side='right', fill='x', expand=True)
+        self.pinnameentry.bind('<Return>', self.setpinvalue)
+        self.pinnameentry.bind('<KP_Enter>', self.setpinvalue)
+        self.pinnameentry.bind('<Escape>', lambda e: self.setpinvalue(None))
+        self.pinnameentry.bind('<FocusOut>', self.setpinvalue)
+
+        self.pinnumberframe = ttk.Frame(pf)
+        ttk.Label(self.pinnumberframe, text='Set Pin Number').pack(side='left')
+        self.pinnumber = tk.IntVar()
+        self.pinnumberentry = ttk.Spinbox(self.pinnumberframe, from_=1, to=1000, textvariable=self.pinnumber)
+        self.pinnumberentry.pack(side='right', fill='x', expand=True)
+        self.pinnumberentry.bind('<Return>', self.setpinvalue)
+        self.pinnumberentry.bind('<KP_Enter>', self.setpinvalue)
+        self.pinnumberentry.bind('<Escape>', lambda e: self.setpinvalue(None))
+        self.pinnumberentry.bind('<FocusOut>', self.setpinvalue)
+        
+        self.table: PinTable = VirtualPinTable(rmf, self.store) if virtualtable else TreePinTable(rmf, self.store)
+        self.table.pack(fill='both', expand=True)
+        self.tree = self.table.tree
+        if self.instrument: self.instrument.counttcl(self.tree, 'tree')
+        self.tree.bind("<Button-1>", self.selectpin)
+        self.tree.bind("<Double-1>", self.showpinedit)
+        self.tree.bind("<Escape>", lambda e: self.selectpin(None))
+        self.tree.bind("<Control-v>", self.pastepintable)
+        
+        exportframe = ttk.Frame(scrolledframe.interior)
+        exportframe.pack(side='bottom', fill='x')
+        self.exportbutton = ttk.Button(exportframe, text='Export', command=self.export)
+        self.exportbutton.pack(fill='x')
+        ## Replaces the Export button while an export is running
+        self.exportprogressframe = ttk.Frame(exportframe)
+        ## A single part is exported, so the progress bar only shows that the export is still running
+        self.exportprogress = ttk.Progressbar(self.exportprogressframe, mode='indeterminate')
+        self.exportprogress.pack(side='left', fill='x', expand=True)
+        ttk.Button(self.exportprogressframe, text='Cancel', command=self.cancelexport).pack(side='right')
+        self.exportjob: typing.Optional[ExportJob] = None
+
+        checkformats(exportformats)
+        formatframe = ttk.Frame(scrolledframe.interior)
+        formatframe.pack(side='bottom', fill='x')
+        ttk.Label(formatframe, text='Also Export').pack(side='left')
+        ## The formats which can be exported alongside the SVG and TXT
+        self.exportformats: dict[str, tk.BooleanVar] = {}
+        for (format, exportformat) in FORMATS.items():
+            if format in DEFAULTFORMATS or format in ALTERNATEFORMATS: continue
+            self.exportformats[format] = tk.BooleanVar(value=format in exportformats)
+            ttk.Checkbutton(formatframe, text=exportformat.suffix, variable=self.exportformats[format]).pack(side='left')
+        self.compactsvg = tk.BooleanVar(value=compactsvg)
+        ttk.Checkbutton(formatframe, text='Compact SVG', variable=self.compactsvg).pack(side='right')
+
+        historyframe = ttk.Frame(scrolledframe.interior)
+        historyframe.pack(side='bottom', fill='x')
+        ttk.Button(historyframe, text='Undo', command=self.undo).pack(side='left', fill='x', expand=True)
+        ttk.Button(historyframe, text='Redo', command=self.redo).pack(side='right', fill='x', expand=True)
+
+        projectframe = ttk.Frame(scrolledframe.interior)
+        projectframe.pack(side='bottom', fill='x')
+        ttk.Button(projectframe, text='Open Project', command=self.openproject).pack(side='left', fill='x', expand=True)
+        ttk.Button(projectframe, text='Save Project', command=self.saveproject).pack(side='right', fill='x', expand=True)
+
+        pintableframe = ttk.Frame(scrolledframe.interior)
+        pintableframe.pack(side='bottom', fill='x')
+        ttk.Button(pintableframe, text='Import Pin Table', command=self.importpintable).pack(side='left', fill='x', expand=True)
+        ttk.Button(pintableframe, text='Paste Pin Table', command=self.pastepintable).pack(side='right', fill='x', expand=True)
+
+        ## Writes are coalesced so that only one draw happens per idle cycle
+        self.scheduler = RenderScheduler(self, self.draw, maxfps=maxfps)
+        self.width.trace_add('write', self.scheduler.request)
+        self.height.trace_add('write', self.scheduler.request)
+        self.top_pins.trace_add('write', self.scheduler.request)
+        self.bottom_pins.trace_add('write', self.scheduler.request)
+        self.left_pins.trace_add('write', self.scheduler.request)
+        self.right_pins.trace_add('write', self.scheduler.request)
+
+        if self.instrument:
+            self.hud = self.canvas.create_text(4, CANVASSIZE - 4, anchor='sw', text='', fill='gray30')
+            self.updatehud()
+
+        self.canvas.bind('<Button-1>', self.startselection)
+        self.canvas.bind('<B1-Motion>', self.dragselection)
+        self.canvas.bind('<ButtonRelease-1>', self.endselection)
+        self.canvas.bind('<Motion>', self.hover)
+        self.canvas.bind('<Leave>', lambda e: self.sethover(None))
+        self.canvas.bind('<MouseWheel>', self.onwheel)
+        self.canvas.bind('<Button-4>', self.onwheel)
+        self.canvas.bind('<Button-5>', self.onwheel)
+        for button in (2, 3):
+            self.canvas.bind(f'<Button-{button}>', self.startpan)
+            self.canvas.bind(f'<B{button}-Motion>', self.dragpan)
+            self.canvas.bind(f'<Double-Button-{button}>', self.resetview)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.bind('<Control-z>', self.undo)
+        self.bind('<Control-y>', self.redo)
+        self.bind('<Control-Z>', self.redo)
+
+        self.draw()
+
+    def getpincounts(self)-> dict[Side, int]:
+        return {side: getattr(self, side.value + '_pins').get() for side in Side.__members__.values()}
+
+    def draw(self, *args):
+        ## The spinboxes may be empty while manually entering the value
+        try:
+            width = self.width.get()
+            height = self.height.get()
+            pincounts = self.getpincounts()
+        except:
+            return
+        ## Typed values are not limited by the spinboxes, so a count which is out of range is treated the same way
+        if any(count > MAXPINS for count in pincounts.values()): return
+            
+        self.store.setdimensions(width, height)
+        removed: list[Pin] = []
+        added: list[Pin] = []
+        for (side, pins) in pincounts.items():
+            (sideremoved, sideadded) = self.store.resize(side, pins)
+            removed.extend(sideremoved)
+            added.extend(sideadded)
+        self.table.removepins(removed)
+        self.table.addpins(added)
+        ## Removing a pin can resolve a duplicate pin number for the pins which remain
+        self.refreshpins([pin for removedpin in removed for pin in self.store.getnumberpins(removedpin.number)])
+
+        self.fitlayout = geometry.previewlayout(self.store.width, self.store.height, self.store.pincounts())
+        self.renderer.render(self.viewport.apply(self.fitlayout), self.getpincolor)
+        self.hitindex.update(self.renderer.layout, self.renderer.bands)
+        self.history.checkpoint()
+
+    def getpincolor(self, side: Side, pinid: PinID)-> str:
+        pin = self.store.getpin(side, pinid)
+        if self.store.isduplicate(pin): return DUPLICATECOLOR
+        return "black" if not pin.suppressed else "red"
+
+    def refreshpins(self, pins: typing.Iterable[Pin]):
+        """ Updates the table row and Preview color of each pin (e.g.- after its duplicate status has changed) """
+        for pin in set(pins):
+            self.table.updatepin(pin)
+            item = self.renderer.getitem(pin.side, pin.id)
+            ## Selected pins keep their selection color until they are deselected
+            if item is not None and 'selected' not in self.canvas.gettags(item):
+                self.canvas.itemconfig(item, fill=self.getpincolor(pin.side, pin.id))
+
+    def sortTree(self):
+        """ Moves any pin table rows which are out of order.
+
+            Rows are inserted into their sorted position by draw(), so this normally doesn't move anything.
+        """
+        self.table.sort()
+
+    def geteventpin(self, event)-> typing.Optional[Pin]:
+        """ Returns the pin under (or near) the mouse on the Preview """
+        result = self.hitindex.pinat(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if result is None: return None
+        return self.store.getpin(*result)
+
+    def click(self, event):
+        """ Toggles whether the pin that was clicked is suppressed """
+        pin = self.geteventpin(event)
+        if pin is not None:
+            self.store.togglesuppressed(pin.side, pin.id)
+            self.canvas.itemconfig(self.renderer.getitem(pin.side, pin.id), fill=self.getpincolor(pin.side, pin.id))
+            self.history.checkpoint()
+
+        self.canvas.update()
+
+    def onwheel(self, event):
+        """ Zooms the Preview in or out about the mouse """
+        if event.num == 4: zoomin = True
+        elif event.num == 5: zoomin = False
+        else: zoomin = event.delta > 0
+        self.zoom(ZOOMSTEP if zoomin else 1 / ZOOMSTEP, self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+
+    def zoom(self, factor: float, x: float, y: float):
+        if self.fitlayout is None: return
+        factor = self.viewport.zoomat(factor, x, y)
+        if factor == 1: return
+        ## The existing items are scaled by the Canvas; the layout is only recalculated for hit-testing and the next draw
+        self.renderer.scale(factor, x, y, self.viewport.apply(self.fitlayout))
+        self.hitindex.update(self.renderer.layout, self.renderer.bands)
+
+    def startpan(self, event):
+        self.panstart = (event.x, event.y)
+
+    def dragpan(self, event):
+        if self.panstart is None: return
+        (dx, dy) = (event.x - self.panstart[0], event.y - self.panstart[1])
+        self.panstart = (event.x, event.y)
+        self.pan(dx, dy)
+
+    def pan(self, dx: float, dy: float):
+        if self.fitlayout is None or (dx == 0 and dy == 0): return
+        self.viewport.pan(dx, dy)
+        self.renderer.move(dx, dy, self.viewport.apply(self.fitlayout))
+        self.hitindex.update(self.renderer.layout, self.renderer.bands)
+
+    def resetview(self, event = None):
+        """ Returns the Preview to fitting the whole part """
+        if self.fitlayout is None or self.viewport.isidentity(): return
+        self.viewport.reset()
+        self.renderer.render(self.fitlayout, self.getpincolor)
+        self.hitindex.update(self.renderer.layout, self.renderer.bands)
+
+    def hover(self, event):
+        self.sethover(self.geteventpin(event))
+
+    def sethover(self, pin: typing.Optional[Pin]):
+        """ Highlights the pin under the mouse and shows its name and number """
+        if pin is self.hovered: return
+        if self.hovered is not None and self.hovered in self.store:
+            item = self.renderer.getitem(self.hovered.side, self.hovered.id)
+            if item is not None: self.canvas.itemconfig(item, width=LINETHICKNESS)
+        self.hovered = pin
+        text = ""
+        if pin is not None:
+            item = self.renderer.getitem(pin.side, pin.id)
+            if item is not None: self.canvas.itemconfig(item, width=HOVERTHICKNESS)
+            text = pin.name + (f" (Pin {pin.number})" if pin.number is not None else "")
+        self.canvas.itemconfig(self.hovertext, text=text)
+
+    def startselection(self, event):
+        self.selectionstart = (self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+
+    def dragselection(self, event):
+        if self.selectionstart is None: return
+        (x1, y1) = self.selectionstart
+        (x2, y2) = (self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if self.selectionbox is not None:
+            self.canvas.coords(self.selectionbox, x1, y1, x2, y2)
+        elif max(abs(x2 - x1), abs(y2 - y1)) >= DRAGTHRESHOLD:
+            self.selectionbox = self.canvas.create_rectangle(x1, y1, x2, y2, outline='blue', dash=(4, 2))
+
+    def endselection(self, event):
+        """ Toggles the pin which was clicked, or the suppression of every pin in the box which was dragged """
+        start = self.selectionstart
+        self.selectionstart = None
+        if start is None: return
+        if self.selectionbox is None: return self.click(event)
+        self.canvas.delete(self.selectionbox)
+        self.selectionbox = None
+        (x2, y2) = (self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        self.suppresspins([self.store.getpin(side, pinid) for (side, pinid) in self.hitindex.pinsin(*start, x2, y2)])
+
+    def suppresspins(self, pins: typing.Sequence[Pin]):
+        """ Suppresses every pin, unless they are all already suppressed in which case they are all unsuppressed """
+        if not pins: return
+        suppressed = not all(pin.suppressed for pin in pins)
+        for pin in pins:
+            self.store.setsuppressed(pin.side, pin.id, suppressed)
+            item = self.renderer.getitem(pin.side, pin.id)
+            if 'selected' not in self.canvas.gettags(item):
+                self.canvas.itemconfig(item, fill=self.getpincolor(pin.side, pin.id))
+        self.history.checkpoint()
+
+    def gettreepin(self, event)-> tuple[IID, Pin]:
+        pin = self.table.identifypin(event)
+        if not pin: return  ## type: ignore
+
+        return (pin.iid, pin)
+    
+    def selectpin(self, event):
+        for item in self.canvas.find_withtag('selected'):
+            tags = self.canvas.gettags(item)
+            side = Side(tags[1])
+            self.canvas.itemconfig(item, fill = self.getpincolor(side, int(tags[2])))
+            self.canvas.dtag(item, 'selected')
+        if not event: return self.canvas.update()
+        self.table.select(None)
+        result = self.gettreepin(event)
+        if not result: return self.canvas.update()
+        (piniid, pin) = result
+        self.table.select(pin)
+        self.canvas.addtag_withtag('selected', piniid)
+        self.canvas.itemconfig("selected", fill='blue')
+        self.canvas.update()
+
+    def showpinedit(self, event):
+        result = self.gettreepin(event)
+        if not result: return
+        (pinid, pin) = result
+        name = pin.name
+        self.pinname.set(name)
+        self.pinnumber.set(pin.number if pin.number else 0)
+        columnid = self.tree.identify_column(event.x)
+        if columnid == '#2':
+            pinnumber = pin.number if pin.number else 1
+            self.pinnumberframe.pack(side='top', fill='x')
+            self.pinnumberentry.focus()
+            self.pinnumberentry.selection_range(0, 'end')
+            self.selected = pinid
+            self.pinnumber.set(pinnumber)
+        elif columnid == '#3':
+            self.pinnameframe.pack(side='top', fill='x')
+            self.pinnameentry.focus()
+            self.pinnameentry.selection_range(0, 'end')
+            self.selected = pinid
+            self.pinname.set(name)
+
+    def setpinvalue(self, event):
+        if not event:
+            self.selected = ""
+            self.pinnumberframe.pack_forget()
+            return self.pinnameframe.pack_forget()
+        ## If the pinnameentry is managed, then we're setting the name
+        isname = bool(self.pinnameframe.winfo_manager())
+        pinid = self.selected
+        if not pinid:
+            self.pinnumberframe.pack_forget()
+            return self.pinnameframe.pack_forget()
+        side, number = getpinsideandid(pinid)
+        if isname:
+            ## An empty name resets the pin to its default name
+            pin = self.store.setname(side, number, self.pinname.get())
+            self.table.updatepin(pin)
+            self.history.checkpoint()
+            self.selected = ""
+            self.pinnameframe.pack_forget()
+        else:
+            try:
+                newnumber = self.pinnumber.get()
+            except:
+                newnumber = None
+            ## Both the pins which shared the old number and those which share the new one may have changed
+            affected = self.store.getnumberpins(self.store.getpin(side, number).number)
+            pin = self.store.setnumber(side, number, newnumber)
+            affected.extend(self.store.getnumberpins(pin.number))
+            affected.append(pin)
+            self.refreshpins(affected)
+            self.history.checkpoint()
+            self.selected = ""
+            self.pinnumberframe.pack_forget()
+
+    def export(self, filename: typing.Optional[str] = None, formats: typing.Optional[typing.Sequence[str]] = None, compact: typing.Optional[bool] = None):
+        """ Exports the design, asking for the file name
+
+            If filename is provided the design is exported there without showing any dialogs (an
+            existing file is overwritten and DuplicatePinNumbersError is raised for duplicate pin numbers).
+            Otherwise the design is exported in the background (see ICSVGDesigner.export.ExportJob)
+            and can be cancelled until it finishes.
+            formats are exported alongside the SVG and TXT, and default to the checked formats. compact
+            defaults to whether Compact SVG is checked.
+        """
+        ## Make sure the pins are up to date with the spinboxes
+        self.scheduler.flush()
+        if formats is None:
+            formats = [format for (format, checked) in self.exportformats.items() if checked.get()]
+        if compact is None:
+            compact = self.compactsvg.get()
+        if filename:
+            exportpart(self.store, filename, formats, compact)
+            return
+        if self.exportjob is not None: return
+        ## Need to check pinnumbers before asking for file name
+        output = getduplicatemessages(self.store)
+        if output:
+            ## Bring the first conflicting row into view so it doesn't need to be searched for
+            (firstpin, *_) = next(iter(self.store.duplicatenumbers().values()))
+            self.table.see(firstpin)
+            messagebox.showerror("Duplicate Pin Numbers", "\n".join(output))
+            return
+
+        filename = filedialog.asksaveasfilename(defaultextension='.svg', filetypes=[('SVG Files', '*.svg')])
+        if not filename: return
+        ## The dialog only asks about the SVG
+        formats = (getsvgformat(compact), 'txt') + tuple(formats)
+        paths = [getformatpath(filename, format) for format in formats if FORMATS[format].suffix != '.svg']
+        existing = [str(path) for path in paths if path.exists()]
+        if(existing and not messagebox.askyesno("Overwrite?", f"{', '.join(existing)} already exist{'s' if len(existing) == 1 else ''}. Overwrite?")):
+            return
+
+        self.exportjob = ExportJob(self.store, filename, formats).start()
+        self.exportprogress.start()
+        self.exportbutton.pack_forget()
+        self.exportprogressframe.pack(fill='x')
+        self.after(EXPORTPOLL, self.pollexport)
+
+    def pollexport(self):
+        """ Waits for the background export to finish and reports its result """
+        job = self.exportjob
+        if job is None: return
+        if not job.finished.is_set():
+            self.after(EXPORTPOLL, self.pollexport)
+            return
+        self.exportjob = None
+        self.exportprogress.stop()
+        self.exportprogressframe.pack_forget()
+        self.exportbutton.pack(fill='x')
+        if isinstance(job.error, ExportCancelled): return
+        if job.error is not None:
+            messagebox.showerror("Could not Export", str(job.error))
+            return
+        messagebox.showinfo("Exported", f"Exported to {next(iter(job.paths.values()))}")
+
+    def cancelexport(self):
+        """ Cancels the background export. None of its files are written """
+        if self.exportjob is not None: self.exportjob.cancel()
+
+    def showstore(self):
+        """ Rebuilds the pin table and Preview after the store has been replaced """
+        self.setpinvalue(None)
+        self.sethover(None)
+        self.table.select(None)
+        self.table.refresh()
+        self.renderer.clear()
+        self.viewport.reset()
+        self.history.reset()
+        self.showdimensions()
+
+    def showdimensions(self):
+        """ Sets the spinboxes to the store's dimensions and pin counts and redraws the Preview """
+        self.width.set(self.store.width)
+        self.height.set(self.store.height)
+        for (side, count) in self.store.pincounts().items():
+            getattr(self, side.value + '_pins').set(count)
+        ## The store already matches the spinboxes, so this only redraws the Preview
+        self.scheduler.flush()
+
+    def istyping(self, event = None)-> bool:
+        """ Whether a keyboard shortcut was pressed in an entry, where it should only affect the entry's text """
+        if event is None: return False
+        try:
+            return isinstance(self.focus_get(), tk.Entry)
+        except KeyError:
+            ## focus_get() fails when the focus is in a popdown (e.g.- a combobox's list)
+            return False
+
+    def undo(self, event = None):
+        if self.istyping(event): return
+        ## Any pending change to the spinboxes is undone first
+        self.scheduler.flush()
+        self.showrestore(self.history.undo())
+
+    def redo(self, event = None):
+        if self.istyping(event): return
+        self.scheduler.flush()
+        self.showrestore(self.history.redo())
+
+    def showrestore(self, result: typing.Optional[RestoreResult]):
+        """ Updates the pin table and Preview after the History has changed the store """
+        if result is None: return
+        self.setpinvalue(None)
+        self.table.removepins(result.removed)
+        self.table.addpins(result.added)
+        self.showdimensions()
+        self.refreshpins(result.changed)
+
+    def settitle(self):
+        self.title(f"ICSVGDesigner - {self.project.path.name}" if self.project else "ICSVGDesigner")
+
+    def openproject(self, filename: typing.Optional[str] = None):
+        if not filename:
+            filename = filedialog.askopenfilename(filetypes=[('ICSVGDesigner Projects', '*' + PROJECTSUFFIX)])
+            if not filename: return
+        self.scheduler.flush()
+        ## The project is loaded separately so that the current design (and project) are untouched if it can't be
+        try:
+            loaded = loadproject(filename)
+        except (ProjectError, PartDefinitionError, OSError) as e:
+            messagebox.showerror("Could not open Project", str(e))
+            return
+        if self.project is not None:
+            self.project.close()
+            self.project = None
+        try:
+            self.project = Project.attach(filename, self.store, loaded)
+        except OSError as e:
+            ## The design was loaded, but it can't be autosaved
+            messagebox.showerror("Could not open Project", str(e))
+        self.showstore()
+        self.settitle()
+
+    def saveproject(self):
+        """ Saves the design as a project (asking for a file name the first time) """
+        self.scheduler.flush()
+        try:
+            if self.project is None:
+                filename = filedialog.asksaveasfilename(defaultextension=PROJECTSUFFIX, filetypes=[('ICSVGDesigner Projects', '*' + PROJECTSUFFIX)])
+                if not filename: return
+                self.project = Project.create(filename, self.store)
+            else:
+                self.project.save()
+        except OSError as e:
+            messagebox.showerror("Could not save Project", str(e))
+        self.settitle()
+
+    def importpintable(self, filename: typing.Optional[str] = None):
+        """ Assigns the pins' values from a CSV or tab-separated Pin Table file (see ICSVGDesigner.parts) """
+        if not filename:
+            filename = filedialog.askopenfilename(filetypes=[('Pin Tables', '*.csv *.tsv *.txt'), ('All Files', '*')])
+            if not filename: return
+        try:
+            with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Could not import Pin Table", str(e))
+            return
+        self.importpins(text)
+
+    def pastepintable(self, event = None):
+        """ Assigns the pins' values from a Pin Table on the clipboard (e.g.- copied from a datasheet or spreadsheet) """
+        try:
+            text = self.clipboard_get()
+        except tk.TclError:
+            messagebox.showerror("Could not paste Pin Table", "The clipboard is empty")
+            return
+        self.importpins(text)
+
+    def importpins(self, text: str):
+        """ Applies a Pin Table as a single change
+
+            The store is updated in one pass, then the pin table rows are updated, the Preview is
+            redrawn once and any duplicate pin numbers are reported together.
+        """
+        self.scheduler.flush()
+        try:
+            result = applypintable(self.store, parsepintable(text))
+        except PartDefinitionError as e:
+            messagebox.showerror("Could not import Pin Table", str(e))
+            return
+        self.setpinvalue(None)
+        self.table.addpins(result.added)
+        ## Any sides which were extended need their spinboxes updated (this also redraws the Preview)
+        self.showdimensions()
+        self.refreshpins(result.changed)
+        self.history.checkpoint()
+        duplicates = getduplicatemessages(self.store)
+        if duplicates:
+            (firstpin, *_) = next(iter(self.store.duplicatenumbers().values()))
+            self.table.see(firstpin)
+            messagebox.showwarning("Duplicate Pin Numbers", "\n".join(duplicates))
+
+    def updatehud(self):
+        """ Shows the latest instrumentation statistics on the Preview """
+        stats = self.instrument.callbacks['draw']
+        redraws = self.scheduler.stats()
+        lines = [f"draw: {stats.last * 1000:.2f}ms (mean {stats.total / stats.calls * 1000 if stats.calls else 0:.2f}ms, max {stats.max * 1000:.2f}ms)",
+                 f"last draw: {stats.lasttclcalls} Tcl calls, {stats.lastcreated} items created",
+                 f"redraws: {redraws['renders']} of {redraws['requests']} requests ({redraws['coalesced']} coalesced)",
+                 f"Tcl calls: {self.instrument.tclcalls()}"]
+        self.canvas.itemconfig(self.hud, text="\n".join(lines))
+        self.after(HUDINTERVAL, self.updatehud)
+
+    def close(self):
+        ## Make sure the last changes to the spinboxes are in the project
+        self.scheduler.flush()
+        if self.project is not None:
+            self.project.close()
+        if self.exportjob is not None:
+            ## Waiting lets the export remove its temporary files
+            self.exportjob.cancel()
+            self.exportjob.wait()
+        if self.instrument is not None:
+            self.instrument.dump({"redraws": self.scheduler.stats(), "pins": len(self.store)})
+        self.destroy()
@@ -0,0 +1,233 @@
+""" Undo/Redo History for a PinStore
+
+Each step of the history is a Snapshot of the whole design. Snapshots are persistent: the pins
+of each side are stored in fixed-size tuples ("chunks") and a new Snapshot only copies the chunk
+containing the pin which changed, sharing every other chunk with the Snapshot before it. Keeping
+a step therefore costs roughly one chunk per pin edited, not a copy of every pin, and pins which
+were removed by shrinking a side are still in the older Snapshots so undoing the shrink restores
+their names and numbers.
+
+Restoring a Snapshot compares chunks by identity, so only the pins in chunks which differ are
+checked and updated.
+"""
+import collections
+import sys
+import typing
+
+from ICSVGDesigner.common import Side
+from ICSVGDesigner.model import SIDEORDER, SIDES, Edit, Pin, PinNumber, PinStore, defaultpinname
+
+## The number of pins in each chunk
+CHUNKSIZE = 64
+## The default maximum number of steps which can be undone
+DEFAULTDEPTH = 200
+## The default limit (in bytes) on the memory used by the steps which can be undone
+DEFAULTMEMORYLIMIT = 64 * 1024 * 1024
+
+## (name, number, suppressed)
+PinState = typing.Tuple[str, PinNumber, bool]
+Chunk = typing.Tuple[PinState, ...]
+
+class SideState(typing.NamedTuple):
+    count: int
+    chunks: typing.Tuple[Chunk, ...]
+
+class Snapshot(typing.NamedTuple):
+    width: int
+    height: int
+    ## In SIDES order
+    sides: typing.Tuple[SideState, ...]
+
+class RestoreResult(typing.NamedTuple):
+    """ The changes made to the store when a Snapshot was restored """
+    removed: list[Pin]
+    added: list[Pin]
+    ## Pins whose values or duplicate pin number status may have changed
+    changed: list[Pin]
+
+def getpinstate(pin: Pin)-> PinState:
+    return (pin.name, pin.number, pin.suppressed)
+
+def tochunks(states: typing.Sequence[PinState])-> typing.Tuple[Chunk, ...]:
+    return tuple(tuple(states[i:i + CHUNKSIZE]) for i in range(0, len(states), CHUNKSIZE))
+
+def snapshotstore(store: PinStore)-> Snapshot:
+    """ Creates a Snapshot of the store (without any sharing) """
+    return Snapshot(store.width, store.height,
+                    tuple(SideState(store.count(side), tochunks([getpinstate(pin) for pin in store.sides[side]])) for side in SIDES))
+
+def resizeside(side: Side, sidestate: SideState, count: int)-> SideState:
+    """ Returns the SideState with pins removed from (or default pins added to) the end of the side """
+    chunks = sidestate.chunks
+    if count < sidestate.count:
+        (full, remainder) = divmod(count, CHUNKSIZE)
+        chunks = chunks[:full] + ((chunks[full][:remainder],) if remainder else ())
+        return SideState(count, chunks)
+    ## Only the last (partially filled) chunk needs to be copied
+    states: list[PinState] = []
+    if chunks and len(chunks[-1]) < CHUNKSIZE:
+        states.extend(chunks[-1])
+        chunks = chunks[:-1]
+    states.extend((defaultpinname(side, i), None, False) for i in range(sidestate.count, count))
+    return SideState(count, chunks + tochunks(states))
+
+def setpinstate(sidestate: SideState, pinid: int, state: PinState)-> SideState:
+    (chunkindex, offset) = divmod(pinid, CHUNKSIZE)
+    chunk = sidestate.chunks[chunkindex]
+    chunk = chunk[:offset] + (state,) + chunk[offset + 1:]
+    return SideState(sidestate.count, sidestate.chunks[:chunkindex] + (chunk,) + sidestate.chunks[chunkindex + 1:])
+
+def applyedit(snapshot: Snapshot, edit: Edit)-> Snapshot:
+    """ Returns a new Snapshot with the Edit applied (sharing all unchanged chunks with snapshot) """
+    if edit.op == 'dimensions':
+        (width, height) = edit.value
+        return snapshot._replace(width=width, height=height)
+    order = SIDEORDER[edit.side]
+    sidestate = snapshot.sides[order]
+    if edit.op == 'resize':
+        sidestate = resizeside(edit.side, sidestate, edit.value)
+    else:
+        (name, number, suppressed) = sidestate.chunks[edit.id // CHUNKSIZE][edit.id % CHUNKSIZE]
+        if edit.op == 'name': name = edit.value
+        elif edit.op == 'number': number = edit.value
+        elif edit.op == 'suppressed': suppressed = edit.value
+        else: raise ValueError(f"Unknown edit {edit.op!r}")
+        sidestate = setpinstate(sidestate, edit.id, (name, number, suppressed))
+    return snapshot._replace(sides=snapshot.sides[:order] + (sidestate,) + snapshot.sides[order + 1:])
+
+def chunkbytes(chunk: Chunk)-> int:
+    return sys.getsizeof(chunk) + sum(sys.getsizeof(state) for state in chunk)
+
+def retainedbytes(snapshot: Snapshot, newer: Snapshot)-> int:
+    """ Estimates the memory used by the chunks of snapshot which are not shared with newer """
+    shared = {id(chunk) for sidestate in newer.sides for chunk in sidestate.chunks}
+    return sum(chunkbytes(chunk) for sidestate in snapshot.sides for chunk in sidestate.chunks if id(chunk) not in shared)
+
+def restore(store: PinStore, current: Snapshot, target: Snapshot)-> RestoreResult:
+    """ Changes the store (which matches current) to match target """
+    result = RestoreResult([], [], [])
+    store.setdimensions(target.width, target.height)
+    for (side, currentside, targetside) in zip(SIDES, current.sides, target.sides):
+        if store.count(side) != targetside.count:
+            (removed, added) = store.resize(side, targetside.count)
+            result.removed.extend(removed)
+            result.added.extend(added)
+            ## Removing a pin can resolve a duplicate pin number
+            for pin in removed: result.changed.extend(store.getnumberpins(pin.number))
+        pins = store.sides[side]
+        for (chunkindex, chunk) in enumerate(targetside.chunks):
+            ## Identical chunks contain identical pins
+            if chunkindex < len(currentside.chunks) and currentside.chunks[chunkindex] is chunk: continue
+            for (offset, (name, number, suppressed)) in enumerate(chunk):
+                pin = pins[chunkindex * CHUNKSIZE + offset]
+                if getpinstate(pin) == (name, number, suppressed): continue
+                if pin.number != number:
+                    result.changed.extend(store.getnumberpins(pin.number))
+                    store.setnumber(side, pin.id, number)
+                    result.changed.extend(store.getnumberpins(number))
+                store.setname(side, pin.id, name)
+                store.setsuppressed(side, pin.id, suppressed)
+                result.changed.append(pin)
+    ## Pins can be changed and then removed by a later side
+    changed = {pin for pin in result.changed if pin in store}
+    result.changed[:] = changed
+    return result
+
+class History:
+    """ Undo/Redo History for a PinStore
+
+        Edits are added to the current step as they are made; checkpoint() ends the step. At most
+        depth steps can be undone. Once the memory retained by the steps which can be undone or
+        redone is over memorylimit, the oldest undo steps are discarded, followed by the redo steps
+        furthest from the current step (at least one step is always kept).
+    """
+    def __init__(self, store: PinStore, depth: int = DEFAULTDEPTH, memorylimit: int = DEFAULTMEMORYLIMIT):
+        self.store = store
+        self.depth = depth
+        self.memorylimit = memorylimit
+        ## Steps which can be undone or redone as (snapshot, retained bytes)
+        self.undostack: collections.deque[typing.Tuple[Snapshot, int]] = collections.deque()
+        self.redostack: list[typing.Tuple[Snapshot, int]] = []
+        ## The retained bytes of both stacks
+        self.memory = 0
+        self.restoring = False
+        self.reset()
+        store.listeners.append(self.record)
+
+    def reset(self):
+        """ Clears the History (e.g.- after a different design has been loaded into the store) """
+        self.current = snapshotstore(self.store)
+        ## The Snapshot at the last checkpoint
+        self.committed = self.current
+        self.undostack.clear()
+        self.redostack.clear()
+        self.memory = 0
+
+    def record(self, edit: Edit):
+        """ Store listener """
+        if self.restoring: return
+        self.current = applyedit(self.current, edit)
+
+    def _push(self, snapshot: Snapshot):
+        cost = retainedbytes(snapshot, self.current)
+        self.undostack.append((snapshot, cost))
+        self.memory += cost
+        while len(self.undostack) > max(self.depth, 0):
+            (_, cost) = self.undostack.popleft()
+            self.memory -= cost
+        self._trim()
+
+    def _trim(self):
+        """ Discards steps until the History is within its memorylimit """
+        while self.memory > self.memorylimit and len(self.undostack) + len(self.redostack) > 1:
+            if len(self.undostack) > 1 or not self.redostack:
+                (_, cost) = self.undostack.popleft()
+            else:
+                (_, cost) = self.redostack.pop(0)
+            self.memory -= cost
+
+    def _clearredo(self):
+        self.memory -= sum(cost for (_, cost) in self.redostack)
+        self.redostack.clear()
+
+    def checkpoint(self)-> bool:
+        """ Ends the current step. Returns True if anything changed during the step """
+        if self.current is self.committed: return False
+        ## The redo steps are discarded first so that they don't count against the new step's memory
+        self._clearredo()
+        self._push(self.committed)
+        self.committed = self.current
+        return True
+
+    def _restore(self, target: Snapshot)-> RestoreResult:
+        self.restoring = True
+        try:
+            result = restore(self.store, self.current, target)
+        finally:
+            self.restoring = False
+        self.current = self.committed = target
+        return result
+
+    def undo(self)-> typing.Optional[RestoreResult]:
+        """ Restores the store to the previous step. Returns None if there is nothing to undo """
+        self.checkpoint()
+        if not self.undostack: return None
+        (target, cost) = self.undostack.pop()
+        self.memory -= cost
+        previous = self.current
+        result = self._restore(target)
+        cost = retainedbytes(previous, target)
+        self.redostack.append((previous, cost))
+        self.memory += cost
+        self._trim()
+        return result
+
+    def redo(self)-> typing.Optional[RestoreResult]:
+        """ Reapplies the last step which was undone. Returns None if there is nothing to redo """
+        if self.current is not self.committed or not self.redostack: return None
+        (target, cost) = self.redostack.pop()
+        self.memory -= cost
+        previous = self.current
+        result = self._restore(target)
+        self._push(previous)
+        return result
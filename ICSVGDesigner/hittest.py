@@ -0,0 +1,82 @@
+""" Hit-testing for the Preview Canvas
+
+Rather than asking Tk to search every Canvas item, pins are found using the layout they were
+drawn from. The pins on each side are evenly spaced along the side in id order, so each side's
+coordinates are already sorted along the side (x for Top and Bottom pins, y for Left and Right
+pins) and the pin nearest a point can be found with a binary search.
+"""
+import bisect
+import math
+import typing
+
+from ICSVGDesigner.common import PinID, Side
+from ICSVGDesigner.geometry import Coordinate, Layout, SideLayout
+
+## How far (in Canvas pixels) a point can be from a pin and still hit it
+HITTOLERANCE = 6
+
+PinRef = typing.Tuple[Side, PinID]
+
+def _isvertical(side: Side)-> bool:
+    """ Top and Bottom pins are vertical lines spaced along the x-axis """
+    return side in (Side.Top, Side.Bottom)
+
+def _axes(sidelayout: SideLayout)-> typing.Tuple[typing.Sequence[Coordinate], Coordinate, Coordinate]:
+    """ Returns the (sorted) positions of the pins along the side and the span of the pins across it """
+    if _isvertical(sidelayout.side):
+        positions = sidelayout.x1
+        across = (sidelayout.y1[0], sidelayout.y2[0])
+    else:
+        positions = sidelayout.y1
+        across = (sidelayout.x1[0], sidelayout.x2[0])
+    return positions, min(across), max(across)
+
+class PinHitIndex:
+    """ Finds the pins at or near a point (or in a rectangle) on the Preview in O(log n) per side """
+    def __init__(self, layout: typing.Optional[Layout] = None, hidden: typing.Iterable[Side] = ()):
+        self.layout = layout
+        ## Sides whose pins are not drawn (see renderer.getband) and so cannot be hit
+        self.hidden = frozenset(hidden)
+
+    def update(self, layout: typing.Optional[Layout], hidden: typing.Iterable[Side] = ()):
+        """ Should be called whenever the pins are redrawn """
+        self.layout = layout
+        self.hidden = frozenset(hidden)
+
+    def pinat(self, x: Coordinate, y: Coordinate, tolerance: float = HITTOLERANCE)-> typing.Optional[PinRef]:
+        """ Returns the pin nearest (x, y) if it is within tolerance of it """
+        if self.layout is None: return None
+        best: typing.Optional[PinRef] = None
+        bestdistance = tolerance
+        for (side, sidelayout) in self.layout.sides.items():
+            if not sidelayout.x1 or side in self.hidden: continue
+            (positions, low, high) = _axes(sidelayout)
+            (along, across) = (x, y) if _isvertical(side) else (y, x)
+            ## Distance from the point to the span of the pins
+            acrossdistance = max(low - across, 0, across - high)
+            if acrossdistance > bestdistance: continue
+            i = bisect.bisect_left(positions, along)
+            for pinid in (i - 1, i):
+                if not 0 <= pinid < len(positions): continue
+                distance = math.hypot(positions[pinid] - along, acrossdistance)
+                if distance <= bestdistance:
+                    best, bestdistance = (side, pinid), distance
+        return best
+
+    def pinsin(self, x1: Coordinate, y1: Coordinate, x2: Coordinate, y2: Coordinate)-> list[PinRef]:
+        """ Returns every pin which is at least partially inside the rectangle """
+        if self.layout is None: return []
+        (left, right), (top, bottom) = sorted((x1, x2)), sorted((y1, y2))
+        pins: list[PinRef] = []
+        for (side, sidelayout) in self.layout.sides.items():
+            if not sidelayout.x1 or side in self.hidden: continue
+            (positions, low, high) = _axes(sidelayout)
+            if _isvertical(side):
+                (alonglow, alonghigh, acrosslow, acrosshigh) = (left, right, top, bottom)
+            else:
+                (alonglow, alonghigh, acrosslow, acrosshigh) = (top, bottom, left, right)
+            if high < acrosslow or low > acrosshigh: continue
+            start = bisect.bisect_left(positions, alonglow)
+            end = bisect.bisect_right(positions, alonghigh)
+            pins.extend((side, pinid) for pinid in range(start, end))
+        return pins
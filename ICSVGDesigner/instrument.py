@@ -0,0 +1,126 @@
+""" Opt-in instrumentation for the ICSVGDesigner GUI
+
+Instrumentation is enabled with the `--profile [OUTPUT]` command line option or by setting the
+ICSVGDESIGNER_PROFILE environment variable (to "1", or to an output path). When enabled:
+
+* The GUI's callbacks (draw, sortTree, click, ...) are timed
+* The Tcl commands issued by the Preview Canvas and pin table are counted (per widget and
+    subcommand, e.g.- "canvas.create"), both overall and for each callback
+* A small HUD in the corner of the Preview shows the latest numbers
+
+When the window is closed the statistics are written to OUTPUT as JSON or, if OUTPUT ends with
+.prof or .pstats, the whole session is profiled with cProfile and its stats are written instead.
+"""
+import collections
+import functools
+import os
+import pathlib
+import time
+import typing
+
+PROFILEENV = 'ICSVGDESIGNER_PROFILE'
+CPROFILESUFFIXES = ('.prof', '.pstats')
+
+def getprofilesetting(value: typing.Optional[str] = None)-> typing.Optional[str]:
+    """ Returns the instrumentation setting from value, or from the environment if value is None
+
+        None means instrumentation is disabled, "" means it is enabled without an output file.
+    """
+    if value is None:
+        value = os.environ.get(PROFILEENV)
+        if not value or value == "0": return None
+    return "" if value == "1" else value
+
+class CallbackStats:
+    __slots__ = ('calls', 'total', 'max', 'last', 'tclcalls', 'lasttclcalls', 'lastcreated')
+    def __init__(self):
+        self.calls = 0
+        ## Seconds
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.tclcalls = 0
+        self.lasttclcalls = 0
+        self.lastcreated = 0
+
+    def todict(self)-> dict[str, typing.Any]:
+        return {"calls": self.calls, "total_ms": self.total * 1000, "mean_ms": self.total / self.calls * 1000 if self.calls else 0,
+                "max_ms": self.max * 1000, "last_ms": self.last * 1000, "tcl_calls": self.tclcalls,
+                "last_tcl_calls": self.lasttclcalls, "last_items_created": self.lastcreated}
+
+class CountingTk:
+    """ Stands in for a widget's Tcl interpreter, counting each command the widget issues """
+    def __init__(self, tk, counter: typing.Counter[str], name: str):
+        self._tk = tk
+        self._counter = counter
+        self._name = name
+
+    def call(self, *args):
+        command = args[0] if len(args) == 1 and isinstance(args[0], tuple) else args
+        ## Widget commands are called as (widget path, subcommand, ...)
+        subcommand = command[1] if len(command) > 1 else command[0]
+        self._counter[f"{self._name}.{subcommand}"] += 1
+        return self._tk.call(*args)
+
+    def __getattr__(self, name: str):
+        return getattr(self._tk, name)
+
+class Instrumentation:
+    def __init__(self, output: typing.Optional[str] = None):
+        self.output = pathlib.Path(output) if output else None
+        self.callbacks: dict[str, CallbackStats] = {}
+        self.tcl: typing.Counter[str] = collections.Counter()
+        self.profiler = None
+        if self.output is not None and self.output.suffix.lower() in CPROFILESUFFIXES:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def counttcl(self, widget, name: str):
+        """ Counts the Tcl commands issued by the widget """
+        widget.tk = CountingTk(widget.tk, self.tcl, name)
+
+    def tclcalls(self)-> int:
+        return sum(self.tcl.values())
+
+    def wrap(self, name: str, function: typing.Callable)-> typing.Callable:
+        """ Returns function, timed and with its Tcl commands and created Canvas items counted """
+        stats = self.callbacks.setdefault(name, CallbackStats())
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tclcalls = self.tclcalls()
+            created = self.tcl['canvas.create']
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stats.calls += 1
+                stats.total += elapsed
+                stats.max = max(stats.max, elapsed)
+                stats.last = elapsed
+                stats.lasttclcalls = self.tclcalls() - tclcalls
+                stats.tclcalls += stats.lasttclcalls
+                stats.lastcreated = self.tcl['canvas.create'] - created
+        return wrapper
+
+    def instrumentmethods(self, obj: object, names: typing.Iterable[str]):
+        """ Replaces each of obj's methods with a wrapped version. This has to be done before the methods are bound to any events """
+        for name in names:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+
+    def report(self, extra: typing.Optional[dict[str, typing.Any]] = None)-> dict[str, typing.Any]:
+        report: dict[str, typing.Any] = {"callbacks": {name: stats.todict() for (name, stats) in self.callbacks.items() if stats.calls},
+                                         "tcl": dict(self.tcl.most_common())}
+        if extra: report.update(extra)
+        return report
+
+    def dump(self, extra: typing.Optional[dict[str, typing.Any]] = None):
+        """ Writes the statistics (or cProfile stats) to the output file, if there is one """
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(str(self.output))
+        elif self.output is not None:
+            import json
+            with open(self.output, 'w') as f:
+                json.dump(self.report(extra), f, indent=4)
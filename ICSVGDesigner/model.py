@@ -0,0 +1,277 @@
+""" Pin data for ICSVGDesigner
+
+The PinStore is the source of truth for a design: the Preview Canvas and the pin table
+are only views of it.
+"""
+import bisect
+import typing
+
+from ICSVGDesigner.common import IID, PinID, Side, getpiniid
+
+## Pins are ordered Top, Bottom, Left, Right and then by id
+SIDEORDER: dict[Side, int] = {side: i for (i, side) in enumerate(Side.__members__.values())}
+SIDES: list[Side] = list(Side.__members__.values())
+
+PinKey = typing.Tuple[int, PinID]
+
+## The most pins a side can have. Larger parts are very slow to draw and export
+MAXPINS = 10000
+
+class PinIndex:
+    """ Keeps every pin ordered by (side, pin id)
+
+        The position of a pin in the index is also its row in the pin table, which
+        lets new rows be inserted directly into place instead of sorting the table.
+    """
+    def __init__(self):
+        self.keys: list[PinKey] = []
+
+    def __len__(self)-> int:
+        return len(self.keys)
+
+    def __iter__(self)-> typing.Iterator[typing.Tuple[Side, PinID]]:
+        for (order, pinid) in self.keys:
+            yield SIDES[order], pinid
+
+    def __contains__(self, pin: typing.Tuple[Side, PinID])-> bool:
+        (side, pinid) = pin
+        key = (SIDEORDER[side], pinid)
+        position = bisect.bisect_left(self.keys, key)
+        return position < len(self.keys) and self.keys[position] == key
+
+    def position(self, side: Side, pinid: PinID)-> int:
+        """ Returns the position the pin has (or would have) in the index """
+        return bisect.bisect_left(self.keys, (SIDEORDER[side], pinid))
+
+    def insert(self, side: Side, pinid: PinID)-> int:
+        """ Adds the pin to the index and returns its position """
+        key = (SIDEORDER[side], pinid)
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            raise ValueError(f"{side.name} Pin {pinid} is already indexed")
+        self.keys.insert(position, key)
+        return position
+
+    def remove(self, side: Side, pinid: PinID)-> int:
+        """ Removes the pin from the index and returns the position it had """
+        key = (SIDEORDER[side], pinid)
+        position = bisect.bisect_left(self.keys, key)
+        if position == len(self.keys) or self.keys[position] != key:
+            raise ValueError(f"{side.name} Pin {pinid} is not indexed")
+        del self.keys[position]
+        return position
+
+    def clear(self):
+        self.keys.clear()
+
+PinNumber = typing.Optional[int]
+
+def defaultpinname(side: Side, pinid: PinID)-> str:
+    return f"{side.name} Pin {pinid + 1}"
+
+class Pin:
+    """ A single pin. Pins are identified by their side and id (their 0-indexed position along that side) """
+    __slots__ = ('side', 'id', 'suppressed', 'name', 'number')
+    def __init__(self, side: Side, id: PinID, suppressed: bool = False, name: typing.Optional[str] = None, number: PinNumber = None):
+        self.side = side
+        self.id = id
+        self.suppressed = suppressed
+        self.name: str = name if name else defaultpinname(side, id)
+        self.number = number
+
+    @property
+    def iid(self)-> IID:
+        return getpiniid(self.side, self.id)
+
+    def __repr__(self)-> str:
+        return f"Pin({self.side}, {self.id}, suppressed={self.suppressed}, name={self.name!r}, number={self.number})"
+
+class Edit(typing.NamedTuple):
+    """ A single change to a PinStore, as passed to the store's listeners
+
+        op is one of:
+            "dimensions": value is the (width, height) of the body
+            "resize": value is the new number of pins on side
+            "name", "number", "suppressed": value is the new value of that attribute of the pin
+    """
+    op: str
+    side: typing.Optional[Side] = None
+    id: typing.Optional[PinID] = None
+    value: typing.Any = None
+
+EditListener = typing.Callable[[Edit], None]
+
+class PinStore:
+    """ The body dimensions and every pin of a design
+
+        Each change is passed to every function in listeners as an Edit (changes which don't
+        change anything, such as setting a pin's name to its current name, are not).
+    """
+    def __init__(self, width: int = 100, height: int = 100):
+        self.width = width
+        self.height = height
+        ## Pins are stored by side in id order, so a pin's id is its index in the list
+        self.sides: dict[Side, list[Pin]] = {side: [] for side in SIDES}
+        self.index = PinIndex()
+        ## Pin number -> the pins which use it, kept up to date by setnumber() and resize()
+        self.numbers: dict[int, list[Pin]] = {}
+        ## The pin numbers which are used by more than one pin
+        self.duplicates: set[int] = set()
+        self.listeners: list[EditListener] = []
+
+    def __len__(self)-> int:
+        return len(self.index)
+
+    def __iter__(self)-> typing.Iterator[Pin]:
+        """ Iterates over all pins in index order """
+        for side in SIDES:
+            yield from self.sides[side]
+
+    def __contains__(self, pin: Pin)-> bool:
+        """ Returns True if the pin has not been removed from the store """
+        pins = self.sides[pin.side]
+        return pin.id < len(pins) and pins[pin.id] is pin
+
+    def count(self, side: Side)-> int:
+        return len(self.sides[side])
+
+    def pincounts(self)-> dict[Side, int]:
+        return {side: len(pins) for (side, pins) in self.sides.items()}
+
+    def getpin(self, side: Side, pinid: PinID)-> Pin:
+        pins = self.sides[side]
+        if not 0 <= pinid < len(pins):
+            raise KeyError(f"{side.name} Pin {pinid} does not exist")
+        return pins[pinid]
+
+    def notify(self, edit: Edit):
+        for listener in self.listeners:
+            listener(edit)
+
+    def clear(self, width: int = 100, height: int = 100):
+        """ Removes every pin and resets the dimensions. Listeners are not notified """
+        self.width = width
+        self.height = height
+        for pins in self.sides.values():
+            pins.clear()
+        self.index.clear()
+        self.numbers.clear()
+        self.duplicates.clear()
+
+    def setdimensions(self, width: int, height: int):
+        if (width, height) == (self.width, self.height): return
+        self.width = width
+        self.height = height
+        self.notify(Edit('dimensions', value=(width, height)))
+
+    def resize(self, side: Side, count: int)-> typing.Tuple[list[Pin], list[Pin]]:
+        """ Sets the number of pins on the given side, adding or removing pins from the end of the side
+
+            Returns the (removed, added) pins. Raises ValueError if count is more than MAXPINS
+        """
+        if count > MAXPINS:
+            raise ValueError(f"a side cannot have more than {MAXPINS} pins")
+        pins = self.sides[side]
+        count = max(count, 0)
+        removed: list[Pin] = []
+        added: list[Pin] = []
+        if count < len(pins):
+            removed = pins[count:]
+            del pins[count:]
+            for pin in removed:
+                self.index.remove(side, pin.id)
+                self._unindexnumber(pin)
+        for i in range(len(pins), count):
+            pin = Pin(side, i)
+            pins.append(pin)
+            self.index.insert(side, i)
+            added.append(pin)
+        if removed or added:
+            self.notify(Edit('resize', side, value=count))
+        return removed, added
+
+    def position(self, pin: Pin)-> int:
+        """ Returns the position of the pin in the pin table """
+        return self.index.position(pin.side, pin.id)
+
+    def pinat(self, position: int)-> Pin:
+        """ Returns the pin at the given position in the pin table """
+        (order, pinid) = self.index.keys[position]
+        return self.sides[SIDES[order]][pinid]
+
+    def setname(self, side: Side, pinid: PinID, name: typing.Optional[str])-> Pin:
+        """ Renames the pin. An empty name resets the pin to its default name """
+        pin = self.getpin(side, pinid)
+        name = name if name else defaultpinname(side, pinid)
+        if name == pin.name: return pin
+        pin.name = name
+        self.notify(Edit('name', side, pinid, name))
+        return pin
+
+    def setnumber(self, side: Side, pinid: PinID, number: PinNumber)-> Pin:
+        """ Sets the pin's number. None (or 0) clears it """
+        pin = self.getpin(side, pinid)
+        number = number if number else None
+        if number == pin.number: return pin
+        self._unindexnumber(pin)
+        pin.number = number
+        self._indexnumber(pin)
+        self.notify(Edit('number', side, pinid, number))
+        return pin
+
+    def setsuppressed(self, side: Side, pinid: PinID, suppressed: bool)-> Pin:
+        """ Suppressed pins are not exported """
+        pin = self.getpin(side, pinid)
+        suppressed = bool(suppressed)
+        if suppressed == pin.suppressed: return pin
+        pin.suppressed = suppressed
+        self.notify(Edit('suppressed', side, pinid, suppressed))
+        return pin
+
+    def togglesuppressed(self, side: Side, pinid: PinID)-> Pin:
+        return self.setsuppressed(side, pinid, not self.getpin(side, pinid).suppressed)
+
+    def apply(self, edit: Edit):
+        """ Makes the change described by the Edit """
+        if edit.op == 'dimensions':
+            (width, height) = edit.value
+            self.setdimensions(width, height)
+        elif edit.op == 'resize':
+            self.resize(edit.side, edit.value)
+        elif edit.op == 'name':
+            self.setname(edit.side, edit.id, edit.value)
+        elif edit.op == 'number':
+            self.setnumber(edit.side, edit.id, edit.value)
+        elif edit.op == 'suppressed':
+            self.setsuppressed(edit.side, edit.id, edit.value)
+        else:
+            raise ValueError(f"Unknown edit {edit.op!r}")
+
+    def _indexnumber(self, pin: Pin):
+        if pin.number is None: return
+        pins = self.numbers.setdefault(pin.number, [])
+        pins.append(pin)
+        if len(pins) > 1: self.duplicates.add(pin.number)
+
+    def _unindexnumber(self, pin: Pin):
+        if pin.number is None: return
+        pins = self.numbers[pin.number]
+        pins.remove(pin)
+        if len(pins) < 2: self.duplicates.discard(pin.number)
+        if not pins: del self.numbers[pin.number]
+
+    def getnumberpins(self, number: PinNumber)-> list[Pin]:
+        """ Returns the pins which use the given pin number """
+        if number is None: return []
+        return list(self.numbers.get(number, []))
+
+    def isduplicate(self, pin: Pin)-> bool:
+        """ Returns True if the pin's number is shared with another pin """
+        return pin.number in self.duplicates
+
+    def hasduplicates(self)-> bool:
+        return bool(self.duplicates)
+
+    def duplicatenumbers(self)-> dict[int, list[Pin]]:
+        """ Returns every pin number which is assigned to more than one pin (with the pins in table order) """
+        return {number: sorted(self.numbers[number], key=self.position) for number in sorted(self.duplicates)}
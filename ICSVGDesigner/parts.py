@@ -0,0 +1,341 @@
+""" Part Definition files for headless exports
+
+A Part Definition describes a complete design: its body dimensions, the number of pins on each
+side and the name, number and suppressed state of any pins which are not left at their defaults.
+
+JSON files contain either a single part, a list of parts or an object with a "parts" list:
+
+    {
+        "name": "LM358",
+        "width": 100, "height": 100,
+        "counts": {"top": 0, "bottom": 0, "left": 4, "right": 4},
+        "pins": [
+            {"side": "left", "id": 0, "name": "OUT1", "number": 1},
+            {"side": "right", "name": "VCC", "number": 8, "suppressed": false}
+        ]
+    }
+
+CSV files have one row per pin with a "side" column and optional "part", "width", "height",
+"id", "name", "number" and "suppressed" columns. Rows are grouped into parts by the "part"
+column (defaulting to the file's name), and each part's width and height are taken from the
+first row which provides them.
+
+In both formats pin ids are 0-indexed from the Top-Left of each side. Pins without an id are
+given the next id on their side, and a side has at least as many pins as its highest pin id.
+
+Pin Tables (e.g.- pasted from a datasheet) assign values to the pins of an existing design. They
+are CSV or tab-separated, with one row per pin and either a header naming its columns (any of
+PINTABLECOLUMNS, or their aliases) or the columns number, name, side and suppressed in that order.
+Columns with any other header are ignored. The first row is only taken to be a header if it has
+no pin number or side in it.
+Rows with a side are numbered in the same way as Part Definitions; rows without one update the
+pin which already has that pin number.
+"""
+import csv
+import io
+import json
+import pathlib
+import typing
+
+from ICSVGDesigner.common import PinID, Side
+from ICSVGDesigner.model import MAXPINS, SIDEORDER, Pin, PinNumber, PinStore, defaultpinname
+
+DEFAULTSIZE = 100
+DEFINITIONSUFFIXES = ('.json', '.csv')
+TRUEVALUES = ('1', 'true', 'yes', 'y', 'x')
+
+PINTABLECOLUMNS = ('number', 'name', 'side', 'suppressed', 'id')
+## Other headers which are commonly used for the Pin Table columns
+PINTABLEALIASES = {'pin': 'number', 'pin number': 'number', 'pin no': 'number', 'pin #': 'number', 'no': 'number', '#': 'number',
+                   'pin name': 'name', 'signal': 'name'}
+
+class PartDefinitionError(ValueError):
+    """ Raised when a Part Definition is invalid """
+
+class PinDefinition(typing.TypedDict):
+    side: str
+    id: PinID
+    name: typing.Optional[str]
+    number: typing.Optional[int]
+    suppressed: bool
+
+class PartDefinition(typing.TypedDict):
+    name: str
+    width: int
+    height: int
+    counts: dict[str, int]
+    pins: list[PinDefinition]
+
+def _toint(value: typing.Any, field: str, partname: str)-> typing.Optional[int]:
+    if value is None or value == "": return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise PartDefinitionError(f"{partname}: {field} must be an integer (got {value!r})")
+
+def _tobool(value: typing.Any)-> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in TRUEVALUES
+    return bool(value)
+
+def _toside(value: typing.Any, partname: str)-> Side:
+    try:
+        return Side(str(value).strip().lower())
+    except ValueError:
+        raise PartDefinitionError(f"{partname}: invalid side {value!r}")
+
+def normalize(raw: typing.Mapping[str, typing.Any], defaultname: str)-> PartDefinition:
+    """ Validates a Part Definition and fills in its defaults
+
+        Normalized definitions list every customized pin exactly once with an explicit id, sorted
+        by side and then id, and have a count for every side.
+    """
+    if not isinstance(raw, typing.Mapping):
+        raise PartDefinitionError(f"{defaultname}: a part must be an object, not {type(raw).__name__}")
+    name = str(raw.get('name') or defaultname).strip()
+    if not name or any(character in name for character in '/\\:'):
+        raise PartDefinitionError(f"Invalid part name {name!r}")
+    width = _toint(raw.get('width'), 'width', name) or DEFAULTSIZE
+    height = _toint(raw.get('height'), 'height', name) or DEFAULTSIZE
+    if width <= 0 or height <= 0:
+        raise PartDefinitionError(f"{name}: width and height must be positive")
+
+    rawcounts = raw.get('counts') or {}
+    if not isinstance(rawcounts, typing.Mapping):
+        raise PartDefinitionError(f"{name}: counts must be an object mapping sides to pin counts")
+    counts: dict[Side, int] = {side: 0 for side in Side.__members__.values()}
+    for (side, count) in rawcounts.items():
+        count = _toint(count, f'{side} count', name) or 0
+        if count < 0:
+            raise PartDefinitionError(f"{name}: pin counts cannot be negative")
+        if count > MAXPINS:
+            raise PartDefinitionError(f"{name}: a side cannot have more than {MAXPINS} pins")
+        counts[_toside(side, name)] = count
+
+    pins: dict[typing.Tuple[Side, PinID], PinDefinition] = {}
+    nextids: dict[Side, int] = {side: 0 for side in Side.__members__.values()}
+    rawpins = raw.get('pins') or []
+    if not isinstance(rawpins, list):
+        raise PartDefinitionError(f"{name}: pins must be a list")
+    for rawpin in rawpins:
+        if not isinstance(rawpin, typing.Mapping):
+            raise PartDefinitionError(f"{name}: each pin must be an object, not {type(rawpin).__name__}")
+        side = _toside(rawpin.get('side'), name)
+        pinid = _toint(rawpin.get('id'), 'id', name)
+        if pinid is None: pinid = nextids[side]
+        if pinid < 0:
+            raise PartDefinitionError(f"{name}: pin ids cannot be negative")
+        if pinid >= MAXPINS:
+            raise PartDefinitionError(f"{name}: a side cannot have more than {MAXPINS} pins")
+        if (side, pinid) in pins:
+            raise PartDefinitionError(f"{name}: {side.name} Pin {pinid} is defined more than once")
+        nextids[side] = pinid + 1
+        counts[side] = max(counts[side], pinid + 1)
+        pinname = rawpin.get('name')
+        pins[(side, pinid)] = PinDefinition(side=side.value, id=pinid,
+                                            name=str(pinname) if pinname not in (None, "") else None,
+                                            number=_toint(rawpin.get('number'), 'number', name) or None,
+                                            suppressed=_tobool(rawpin.get('suppressed', False)))
+
+    return PartDefinition(name=name, width=width, height=height,
+                          counts={side.value: count for (side, count) in counts.items()},
+                          pins=[pins[key] for key in sorted(pins, key=lambda key: (SIDEORDER[key[0]], key[1]))])
+
+def buildstore(definition: PartDefinition, store: typing.Optional[PinStore] = None)-> PinStore:
+    """ Creates a PinStore from a normalized Part Definition. If store is provided its pins are replaced instead """
+    if store is None: store = PinStore(definition['width'], definition['height'])
+    else: store.clear(definition['width'], definition['height'])
+    for (side, count) in definition['counts'].items():
+        store.resize(Side(side), count)
+    for pindef in definition['pins']:
+        side, pinid = Side(pindef['side']), pindef['id']
+        store.setname(side, pinid, pindef['name'])
+        store.setnumber(side, pinid, pindef['number'])
+        store.setsuppressed(side, pinid, pindef['suppressed'])
+    return store
+
+def fromstore(store: PinStore, name: str)-> PartDefinition:
+    """ Creates a normalized Part Definition from a PinStore. Only pins which have been customized are listed """
+    pins: list[PinDefinition] = []
+    for pin in store:
+        pinname = pin.name if pin.name != defaultpinname(pin.side, pin.id) else None
+        if pinname is None and pin.number is None and not pin.suppressed: continue
+        pins.append(PinDefinition(side=pin.side.value, id=pin.id, name=pinname, number=pin.number, suppressed=pin.suppressed))
+    return PartDefinition(name=name, width=store.width, height=store.height,
+                          counts={side.value: count for (side, count) in store.pincounts().items()},
+                          pins=pins)
+
+def loadjson(path: pathlib.Path)-> list[PartDefinition]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise PartDefinitionError(f"{path}: {e}")
+    if isinstance(data, dict) and 'parts' in data:
+        data = data['parts']
+    if isinstance(data, dict):
+        return [normalize(data, path.stem)]
+    if not isinstance(data, list):
+        raise PartDefinitionError(f"{path}: expected a part, a list of parts or an object with a 'parts' list")
+    return [normalize(part, f"{path.stem}_{i + 1}") for (i, part) in enumerate(data)]
+
+def loadcsv(path: pathlib.Path)-> list[PartDefinition]:
+    parts: dict[str, dict[str, typing.Any]] = {}
+    try:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or 'side' not in [field.strip().lower() for field in reader.fieldnames]:
+                raise PartDefinitionError(f"{path}: CSV Part Definitions require a 'side' column")
+            for row in reader:
+                row = {key.strip().lower(): (value.strip() if isinstance(value, str) else value) for (key, value) in row.items() if key}
+                partname = row.get('part') or path.stem
+                part = parts.setdefault(partname, {'name': partname, 'pins': []})
+                for dimension in ('width', 'height'):
+                    if not part.get(dimension) and row.get(dimension):
+                        part[dimension] = row[dimension]
+                part['pins'].append(row)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise PartDefinitionError(f"{path}: {e}")
+    return [normalize(part, path.stem) for part in parts.values()]
+
+def loadfile(path: typing.Union[str, pathlib.Path])-> list[PartDefinition]:
+    path = pathlib.Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.json': return loadjson(path)
+    if suffix == '.csv': return loadcsv(path)
+    raise PartDefinitionError(f"{path}: unsupported Part Definition file (expected {' or '.join(DEFINITIONSUFFIXES)})")
+
+def loadpath(path: typing.Union[str, pathlib.Path])-> list[PartDefinition]:
+    """ Loads all Part Definitions from a file or from every definition file in a directory """
+    path = pathlib.Path(path)
+    if path.is_dir():
+        definitions: list[PartDefinition] = []
+        for child in sorted(path.iterdir()):
+            if child.is_file() and child.suffix.lower() in DEFINITIONSUFFIXES:
+                definitions.extend(loadfile(child))
+        return definitions
+    if not path.exists():
+        raise PartDefinitionError(f"{path} does not exist")
+    return loadfile(path)
+
+class PinAssignment(typing.NamedTuple):
+    """ A row of a Pin Table. Values which are None are left unchanged """
+    ## The line of the table the row came from
+    line: int
+    side: typing.Optional[Side]
+    id: typing.Optional[PinID]
+    name: typing.Optional[str]
+    number: PinNumber
+    suppressed: typing.Optional[bool]
+
+class PinTableResult(typing.NamedTuple):
+    """ The changes made to the store by applypintable() """
+    added: list[Pin]
+    ## Pins whose values or duplicate pin number status may have changed
+    changed: list[Pin]
+
+def _getpintablecolumn(header: str)-> typing.Optional[str]:
+    header = header.strip().lower()
+    if header in PINTABLECOLUMNS: return header
+    return PINTABLEALIASES.get(header)
+
+def _ispintableheader(row: typing.Sequence[str])-> bool:
+    """ Whether the row is a header row
+
+        Every data row has a pin number or a side, so a row containing either is not a header even
+        if its pin names happen to match a header (e.g.- the NO and NC pins of a relay).
+    """
+    cells = [cell.strip().lower() for cell in row]
+    if not any(_getpintablecolumn(cell) for cell in cells): return False
+    sides = {side.value for side in Side.__members__.values()}
+    for cell in cells:
+        if cell in sides: return False
+        try:
+            int(cell)
+            return False
+        except ValueError:
+            pass
+    return True
+
+def parsepintable(text: str)-> list[PinAssignment]:
+    """ Parses a CSV or tab-separated Pin Table """
+    lines = text.splitlines()
+    firstline = next((line for line in lines if line.strip()), "")
+    delimiter = '\t' if '\t' in firstline else ','
+    rows = [(i, row) for (i, row) in enumerate(csv.reader(io.StringIO(text), delimiter=delimiter), start = 1) if any(cell.strip() for cell in row)]
+    if not rows: raise PartDefinitionError("The Pin Table is empty")
+
+    ## Columns with unrecognized headers (e.g.- a datasheet's Description column) are ignored
+    if _ispintableheader(rows[0][1]):
+        columns = [_getpintablecolumn(cell) for cell in rows[0][1]]
+        rows = rows[1:]
+        if not rows: raise PartDefinitionError("The Pin Table has no rows")
+    else:
+        columns = list(PINTABLECOLUMNS[:4])
+
+    assignments: list[PinAssignment] = []
+    nextids: dict[Side, int] = {side: 0 for side in Side.__members__.values()}
+    for (line, row) in rows:
+        values: dict[str, str] = {}
+        for (column, cell) in zip(columns, row):
+            if column is not None and cell.strip(): values[column] = cell.strip()
+        where = f"Line {line}"
+        side = _toside(values['side'], where) if 'side' in values else None
+        pinid = _toint(values.get('id'), 'id', where)
+        number = _toint(values.get('number'), 'number', where)
+        if number is not None and number < 1:
+            raise PartDefinitionError(f"{where}: pin numbers must be at least 1 (got {number})")
+        if side is None and number is None:
+            raise PartDefinitionError(f"{where}: a side or a pin number is required")
+        if side is not None:
+            if pinid is None: pinid = nextids[side]
+            if pinid < 0: raise PartDefinitionError(f"{where}: pin ids cannot be negative")
+            if pinid >= MAXPINS: raise PartDefinitionError(f"{where}: a side cannot have more than {MAXPINS} pins")
+            nextids[side] = pinid + 1
+        elif pinid is not None:
+            raise PartDefinitionError(f"{where}: a pin id requires a side")
+        suppressed = _tobool(values['suppressed']) if 'suppressed' in values else None
+        assignments.append(PinAssignment(line, side, pinid, values.get('name'), number, suppressed))
+    return assignments
+
+def applypintable(store: PinStore, assignments: typing.Sequence[PinAssignment])-> PinTableResult:
+    """ Applies every row of a Pin Table to the store as a single change
+
+        Every row is checked before anything is changed, so an invalid table leaves the store as
+        it was. Sides are extended to include the highest pin id assigned to them (up to MAXPINS).
+        Rows without a side must match exactly one pin's current pin number.
+    """
+    counts = store.pincounts()
+    targets: list[typing.Tuple[Side, PinID, PinAssignment]] = []
+    seen: dict[typing.Tuple[Side, PinID], int] = {}
+    for assignment in assignments:
+        if assignment.side is not None and assignment.id is not None:
+            (side, pinid) = (assignment.side, assignment.id)
+            counts[side] = max(counts[side], pinid + 1)
+            if counts[side] > MAXPINS:
+                raise PartDefinitionError(f"Line {assignment.line}: a side cannot have more than {MAXPINS} pins")
+        else:
+            pins = store.getnumberpins(assignment.number)
+            if len(pins) != 1:
+                raise PartDefinitionError(f"Line {assignment.line}: {'no' if not pins else 'more than one'} pin has pin number {assignment.number}")
+            (side, pinid) = (pins[0].side, pins[0].id)
+        if (side, pinid) in seen:
+            raise PartDefinitionError(f"Line {assignment.line}: {side.name} Pin {pinid + 1} is already assigned on line {seen[(side, pinid)]}")
+        seen[(side, pinid)] = assignment.line
+        targets.append((side, pinid, assignment))
+
+    result = PinTableResult([], [])
+    for (side, count) in counts.items():
+        if count > store.count(side):
+            result.added.extend(store.resize(side, count)[1])
+    for (side, pinid, assignment) in targets:
+        pin = store.getpin(side, pinid)
+        if assignment.name is not None: store.setname(side, pinid, assignment.name)
+        if assignment.suppressed is not None: store.setsuppressed(side, pinid, assignment.suppressed)
+        if assignment.number is not None and assignment.number != pin.number:
+            ## Both the pins which used the old number and the ones which use the new number may have changed
+            result.changed.extend(store.getnumberpins(pin.number))
+            store.setnumber(side, pinid, assignment.number)
+            result.changed.extend(store.getnumberpins(assignment.number))
+        result.changed.append(pin)
+    return result
@@ -0,0 +1,233 @@
+""" The pin table shown beside the Preview Canvas
+
+Both tables are views of a PinStore and share the same interface so that ICSVGDesigner
+does not need to know which one it is using:
+
+* TreePinTable creates one ttk.Treeview row per pin
+* VirtualPinTable only creates the rows which fit in the table and fills them with
+    whichever pins are scrolled into view, so its cost does not grow with the number of pins
+"""
+import abc
+import enum
+from tkinter import ttk
+import typing
+
+from ICSVGDesigner.common import IID, getpinsideandid
+from ICSVGDesigner.model import Pin, PinStore
+
+## The number of rows shown by the VirtualPinTable
+VIRTUALROWS = 20
+## Rows whose pin number is used by another pin are given this tag
+DUPLICATETAG = 'duplicate'
+DUPLICATEBACKGROUND = '#ffc870'
+
+class TreeColumns(enum.Enum):
+    Side = 'Side'
+    PinNumber = 'Pin Number'
+    Name = 'Name'
+
+TreeValues = typing.Tuple[str, typing.Union[int, str], str]
+
+def gettreevalues(pin: Pin)-> TreeValues:
+    return (pin.side.value.capitalize(), pin.number if pin.number is not None else "", pin.name)
+
+def gettreetags(store: PinStore, pin: Pin)-> typing.Tuple[str, ...]:
+    return (DUPLICATETAG,) if store.isduplicate(pin) else ()
+
+class PinTable(ttk.Frame, metaclass=abc.ABCMeta):
+    """ The interface shared by the pin tables. Subclasses must implement every abstractmethod """
+    def __init__(self, master, store: PinStore, **kw):
+        """ Creates the table's Treeview. kw is passed on to the Treeview """
+        super().__init__(master)
+        self.store = store
+        columns = [column.value for column in TreeColumns.__members__.values()]
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', **kw)
+        for label in columns:
+            self.tree.heading(label, text=label)
+        self.tree.tag_configure(DUPLICATETAG, background=DUPLICATEBACKGROUND)
+        self.tree.pack(side='left', fill='both', expand=True)
+
+    @abc.abstractmethod
+    def addpins(self, pins: typing.Sequence[Pin]):
+        """ Called after pins have been added to the store """
+
+    @abc.abstractmethod
+    def removepins(self, pins: typing.Sequence[Pin]):
+        """ Called after pins have been removed from the store """
+
+    @abc.abstractmethod
+    def updatepin(self, pin: Pin):
+        """ Called after a pin's values have changed """
+
+    @abc.abstractmethod
+    def refresh(self):
+        """ Rebuilds the table from the store """
+
+    def sort(self):
+        """ Makes sure the rows are in the same order as the store """
+        pass
+
+    @abc.abstractmethod
+    def identifypin(self, event)-> typing.Optional[Pin]:
+        """ Returns the pin for the row under the event (if any) """
+
+    @abc.abstractmethod
+    def select(self, pin: typing.Optional[Pin]):
+        """ Selects the pin's row, or clears the selection if pin is None """
+
+    @abc.abstractmethod
+    def see(self, pin: Pin):
+        """ Scrolls the table so that the pin's row is visible """
+
+class TreePinTable(PinTable):
+    """ A pin table with one Treeview row per pin. The iid of each row is the pin's iid """
+    def addpins(self, pins: typing.Sequence[Pin]):
+        for pin in pins:
+            ## Rows are inserted directly into their sorted position
+            self.tree.insert('', self.store.position(pin), pin.iid, values=gettreevalues(pin), tags=gettreetags(self.store, pin))
+
+    def removepins(self, pins: typing.Sequence[Pin]):
+        if pins: self.tree.delete(*[pin.iid for pin in pins])
+
+    def updatepin(self, pin: Pin):
+        self.tree.item(pin.iid, values=gettreevalues(pin), tags=gettreetags(self.store, pin))
+
+    def refresh(self):
+        children = self.tree.get_children('')
+        if children: self.tree.delete(*children)
+        for pin in self.store:
+            self.tree.insert('', 'end', pin.iid, values=gettreevalues(pin), tags=gettreetags(self.store, pin))
+
+    def sort(self):
+        """ Moves any rows which are out of order.
+
+            Rows are inserted into their sorted position, so this normally doesn't move anything.
+        """
+        children = self.tree.get_children('')
+        expected: list[IID] = [pin.iid for pin in self.store]
+        if list(children) == expected: return
+        first = 0
+        while first < min(len(children), len(expected)) and children[first] == expected[first]:
+            first += 1
+        for i in range(first, len(expected)):
+            self.tree.move(expected[i], '', i)
+
+    def identifypin(self, event)-> typing.Optional[Pin]:
+        item = self.tree.identify_row(event.y)
+        if not item: return None
+        return self.store.getpin(*getpinsideandid(item))
+
+    def select(self, pin: typing.Optional[Pin]):
+        if pin is None:
+            self.tree.selection_remove(self.tree.selection())
+        else:
+            self.tree.selection_set(pin.iid)
+
+    def see(self, pin: Pin):
+        self.tree.see(pin.iid)
+
+class VirtualPinTable(PinTable):
+    """ A pin table which only has enough Treeview rows to fill the table.
+
+        The rows are reused as the table is scrolled: row i always shows the pin at position top + i.
+    """
+    def __init__(self, master, store: PinStore, rows: int = VIRTUALROWS):
+        super().__init__(master, store, height=rows, selectmode='browse')
+        self.rows: list[IID] = [f"row{i}" for i in range(rows)]
+        self.rowindices: dict[IID, int] = {row: i for (i, row) in enumerate(self.rows)}
+        for row in self.rows:
+            self.tree.insert('', 'end', row, values=("", "", ""))
+        ## The number of rows currently in the Treeview (rows without a pin are detached)
+        self.attached = rows
+        ## The position of the pin shown in the first row
+        self.top = 0
+        self.selected: typing.Optional[Pin] = None
+
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.bind('<MouseWheel>', self.onwheel)
+        self.tree.bind('<Button-4>', self.onwheel)
+        self.tree.bind('<Button-5>', self.onwheel)
+        self.refresh()
+
+    def addpins(self, pins: typing.Sequence[Pin]):
+        if pins: self.refresh()
+
+    def removepins(self, pins: typing.Sequence[Pin]):
+        if not pins: return
+        if self.selected is not None and self.selected in pins:
+            self.selected = None
+        self.refresh()
+
+    def updatepin(self, pin: Pin):
+        position = self.store.position(pin)
+        if self.top <= position < self.top + self.attached:
+            self.tree.item(self.rows[position - self.top], values=gettreevalues(pin), tags=gettreetags(self.store, pin))
+
+    def refresh(self):
+        total = len(self.store)
+        self.top = max(0, min(self.top, total - len(self.rows)))
+        visible = min(len(self.rows), total - self.top)
+        for (i, row) in enumerate(self.rows):
+            if i < visible:
+                ## Reattach rows which were hidden
+                if i >= self.attached: self.tree.move(row, '', i)
+                pin = self.store.pinat(self.top + i)
+                self.tree.item(row, values=gettreevalues(pin), tags=gettreetags(self.store, pin))
+            elif i < self.attached:
+                self.tree.detach(row)
+        self.attached = visible
+        self._showselection()
+        if total: self.scrollbar.set(self.top / total, (self.top + visible) / total)
+        else: self.scrollbar.set(0, 1)
+
+    def _showselection(self):
+        if self.selected is not None:
+            position = self.store.position(self.selected)
+            if self.top <= position < self.top + self.attached:
+                self.tree.selection_set(self.rows[position - self.top])
+                return
+        if self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+    def scrollto(self, top: int):
+        top = max(0, min(top, len(self.store) - len(self.rows)))
+        if top == self.top: return
+        self.top = top
+        self.refresh()
+
+    def yview(self, *args):
+        """ Scrollbar command """
+        if not args: return
+        if args[0] == 'moveto':
+            self.scrollto(round(float(args[1]) * len(self.store)))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages': amount *= len(self.rows)
+            self.scrollto(self.top + amount)
+
+    def onwheel(self, event):
+        if event.num == 4: amount = -3
+        elif event.num == 5: amount = 3
+        else: amount = -3 if event.delta > 0 else 3
+        self.scrollto(self.top + amount)
+        ## Stop the Treeview from trying to scroll itself
+        return "break"
+
+    def identifypin(self, event)-> typing.Optional[Pin]:
+        row = self.tree.identify_row(event.y)
+        if not row: return None
+        position = self.top + self.rowindices[row]
+        if position >= len(self.store): return None
+        return self.store.pinat(position)
+
+    def select(self, pin: typing.Optional[Pin]):
+        self.selected = pin
+        self._showselection()
+
+    def see(self, pin: Pin):
+        position = self.store.position(pin)
+        if position < self.top:
+            self.scrollto(position)
+        elif position >= self.top + len(self.rows):
+            self.scrollto(position - len(self.rows) + 1)
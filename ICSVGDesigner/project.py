@@ -0,0 +1,187 @@
+""" ICSVGDesigner Project files
+
+A project is saved as two files:
+
+* The project file (<name>.icsvgproj): a JSON snapshot of the design as a Part Definition
+* Its journal (<name>.icsvgproj.journal): every edit made since the snapshot, one JSON object per line
+
+While a project is open each edit is appended to the journal as soon as it is made, so
+autosaving an edit costs the same no matter how many pins the design has. Opening a project
+loads the snapshot and replays the journal directly into the PinStore. Saving the project (which
+also happens once the journal reaches COMPACTLIMIT edits) rewrites the snapshot and empties the
+journal.
+
+The first line of the journal records the generation of the snapshot it applies to. A new
+snapshot is written before the journal is emptied, so if ICSVGDesigner stops in between, the old
+journal (whose edits are already in the snapshot) is ignored.
+"""
+import json
+import os
+import pathlib
+import typing
+
+from ICSVGDesigner.common import Side
+from ICSVGDesigner.model import Edit, PinStore
+from ICSVGDesigner import parts
+
+PathLike = typing.Union[str, pathlib.Path]
+
+PROJECTSUFFIX = '.icsvgproj'
+PROJECTFORMAT = 'ICSVGDesigner Project'
+PROJECTVERSION = 1
+## The number of edits the journal can hold before the snapshot is rewritten
+COMPACTLIMIT = 1000
+
+class ProjectError(ValueError):
+    """ Raised when a project file or its journal cannot be read """
+
+def getjournalpath(path: PathLike)-> pathlib.Path:
+    path = pathlib.Path(path)
+    return path.with_name(path.name + '.journal')
+
+def encodeedit(edit: Edit)-> str:
+    side = edit.side.value if edit.side is not None else None
+    return json.dumps({'op': edit.op, 'side': side, 'id': edit.id, 'value': edit.value}, separators=(',', ':'))
+
+def decodeedit(line: str)-> Edit:
+    data = json.loads(line)
+    side = Side(data['side']) if data.get('side') is not None else None
+    value = data.get('value')
+    if data['op'] == 'dimensions': value = tuple(value)
+    return Edit(data['op'], side, data.get('id'), value)
+
+def writesnapshot(path: pathlib.Path, store: PinStore, generation: int):
+    """ Writes the snapshot to a temporary file and then replaces the project file with it """
+    data = {'format': PROJECTFORMAT, 'version': PROJECTVERSION, 'generation': generation,
+            'part': parts.fromstore(store, path.stem)}
+    temppath = path.with_name(path.name + '.tmp')
+    with open(temppath, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temppath, path)
+
+def readsnapshot(path: pathlib.Path)-> typing.Tuple[parts.PartDefinition, int]:
+    """ Returns the project's Part Definition and generation """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ProjectError(f"{path}: {e}")
+    if not isinstance(data, dict) or data.get('format') != PROJECTFORMAT:
+        raise ProjectError(f"{path} is not an ICSVGDesigner Project")
+    version = data.get('version', 0)
+    generation = data.get('generation', 0)
+    ## bool is a subclass of int, but is never written by writesnapshot
+    if not all(isinstance(value, int) and not isinstance(value, bool) for value in (version, generation)):
+        raise ProjectError(f"{path}: the version and generation must be integers")
+    if version > PROJECTVERSION:
+        raise ProjectError(f"{path} was saved by a newer version of ICSVGDesigner")
+    if not isinstance(data.get('part'), dict):
+        raise ProjectError(f"{path} does not contain a part")
+    return parts.normalize(data['part'], path.stem), generation
+
+def readjournal(path: pathlib.Path, generation: int)-> list[Edit]:
+    """ Returns the edits in the journal, if it belongs to the given generation of the snapshot """
+    if not path.exists(): return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except UnicodeDecodeError as e:
+        raise ProjectError(f"{path}: {e}")
+    try:
+        if not lines or json.loads(lines[0]).get('generation') != generation: return []
+    except (json.JSONDecodeError, AttributeError):
+        return []
+    edits: list[Edit] = []
+    for (i, line) in enumerate(lines[1:], start = 2):
+        try:
+            edits.append(decodeedit(line))
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            ## The last edit may have only been partially written
+            if i == len(lines): break
+            raise ProjectError(f"{path}, line {i}: {e}")
+    return edits
+
+class LoadedProject(typing.NamedTuple):
+    """ A project loaded by loadproject() """
+    store: PinStore
+    ## The generation of the project's snapshot
+    generation: int
+    ## The number of edits replayed from the journal
+    edits: int
+
+def loadproject(path: PathLike)-> LoadedProject:
+    """ Loads the project's snapshot and replays its journal into a new PinStore """
+    path = pathlib.Path(path)
+    (definition, generation) = readsnapshot(path)
+    edits = readjournal(getjournalpath(path), generation)
+    store = parts.buildstore(definition)
+    try:
+        for edit in edits:
+            store.apply(edit)
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        ## The edit was well-formed JSON, but does not describe a valid change to the part
+        raise ProjectError(f"{getjournalpath(path)}: {e}")
+    return LoadedProject(store, generation, len(edits))
+
+class Project:
+    """ An open project. Every edit made to the store is recorded in the project's journal """
+    def __init__(self, path: PathLike, store: PinStore, generation: int = 0):
+        self.path = pathlib.Path(path)
+        self.journalpath = getjournalpath(self.path)
+        self.store = store
+        self.generation = generation
+        self.journal: typing.Optional[typing.TextIO] = None
+        ## The number of edits in the journal
+        self.pending = 0
+        store.listeners.append(self.record)
+
+    @classmethod
+    def create(cls, path: PathLike, store: PinStore)-> "Project":
+        """ Saves the store as a new project """
+        project = cls(path, store)
+        project.save()
+        return project
+
+    @classmethod
+    def attach(cls, path: PathLike, store: PinStore, loaded: LoadedProject)-> "Project":
+        """ Replaces the store's pins with a project loaded by loadproject() and starts journaling its edits """
+        path = pathlib.Path(path)
+        ## The store is replaced before the project starts listening to it so none of this is journaled
+        parts.buildstore(parts.fromstore(loaded.store, path.stem), store)
+        project = cls(path, store, loaded.generation)
+        ## Replayed edits are folded into the snapshot so the journal starts out empty
+        if loaded.edits: project.save()
+        else: project.startjournal()
+        return project
+
+    def startjournal(self):
+        """ Replaces the journal with an empty one for the current generation """
+        if self.journal is not None: self.journal.close()
+        self.journal = open(self.journalpath, 'w', encoding='utf-8', newline='\n')
+        self.journal.write(json.dumps({'generation': self.generation}) + '\n')
+        self.journal.flush()
+        self.pending = 0
+
+    def record(self, edit: Edit):
+        """ Store listener: appends the edit to the journal """
+        if self.journal is None: return
+        self.journal.write(encodeedit(edit) + '\n')
+        self.journal.flush()
+        self.pending += 1
+        if self.pending >= COMPACTLIMIT: self.save()
+
+    def save(self):
+        """ Writes a new snapshot and empties the journal """
+        writesnapshot(self.path, self.store, self.generation + 1)
+        self.generation += 1
+        self.startjournal()
+
+    def close(self):
+        """ Saves the project and stops recording edits """
+        if self.record in self.store.listeners: self.store.listeners.remove(self.record)
+        if self.journal is None: return
+        if self.pending: self.save()
+        self.journal.close()
+        self.journal = None
@@ -0,0 +1,137 @@
+""" Incremental renderer for the Preview Canvas
+
+Rather than clearing the Canvas and recreating every item on each redraw, the renderer
+remembers the Canvas item for the body and for each pin and only issues the Tk calls
+needed to get from the previous layout to the new one:
+
+* Pins whose coordinates changed are moved with Canvas.coords
+* Pins which no longer exist are deleted
+* Pins which are new are created
+
+Existing items are never reconfigured, so colors set elsewhere (suppressed/selected) are kept.
+
+Zooming and panning the Preview are done with a single Canvas.scale or Canvas.move of every item
+the renderer has drawn, rather than moving each item. When the pins on a side are too close
+together to be seen individually they are hidden and the side is drawn as a single band instead.
+"""
+import typing
+
+from ICSVGDesigner.common import LINETHICKNESS, PinID, Side, getpiniid
+from ICSVGDesigner.geometry import Coordinate, Layout, Rect, SideLayout
+
+## Returns the fill color for a newly created pin
+PinFill = typing.Callable[[Side, PinID], str]
+
+## Every item drawn by the renderer has this tag
+PARTTAG = 'part'
+## Sides whose pins are closer together than this (in pixels) are drawn as a band
+LODSPACING = 3
+BANDCOLOR = 'gray'
+
+def getband(sidelayout: SideLayout)-> typing.Optional[Rect]:
+    """ Returns the rectangle covering the side's pins if they are too dense to draw individually """
+    if sidelayout.side in (Side.Top, Side.Bottom): positions = sidelayout.x1
+    else: positions = sidelayout.y1
+    if len(positions) < 2 or abs(positions[1] - positions[0]) >= LODSPACING: return None
+    return (min(sidelayout.x1[0], sidelayout.x2[0]), min(sidelayout.y1[0], sidelayout.y2[0]),
+            max(sidelayout.x1[-1], sidelayout.x2[-1]), max(sidelayout.y1[-1], sidelayout.y2[-1]))
+
+class CanvasRenderer:
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.body: typing.Optional[int] = None
+        self.items: dict[Side, list[int]] = {side: [] for side in Side.__members__.values()}
+        self.layout: typing.Optional[Layout] = None
+        ## The band drawn in place of each side whose pins are hidden
+        self.bands: dict[Side, int] = {}
+        ## The rectangle each band was last drawn at, so unchanged bands are not redrawn
+        self.bandrects: dict[Side, Rect] = {}
+
+    def getitem(self, side: Side, pinid: PinID)-> typing.Optional[int]:
+        """ Returns the Canvas item for the given pin, if it has been drawn """
+        items = self.items[side]
+        if 0 <= pinid < len(items): return items[pinid]
+        return None
+
+    def clear(self):
+        """ Removes every item drawn by the renderer """
+        if self.body is not None:
+            self.canvas.delete(self.body)
+        for items in self.items.values():
+            if items: self.canvas.delete(*items)
+            items.clear()
+        for band in self.bands.values():
+            self.canvas.delete(band)
+        self.bands.clear()
+        self.bandrects.clear()
+        self.body = None
+        self.layout = None
+
+    def render(self, layout: Layout, fill: PinFill):
+        canvas = self.canvas
+        previous = self.layout
+
+        if self.body is None:
+            self.body = canvas.create_rectangle(*layout.body, width=LINETHICKNESS, tags=[PARTTAG])
+        elif previous is None or previous.body != layout.body:
+            canvas.coords(self.body, *layout.body)
+
+        for (side, sidelayout) in layout.sides.items():
+            items = self.items[side]
+            (x1, y1, x2, y2) = sidelayout.x1, sidelayout.y1, sidelayout.x2, sidelayout.y2
+            count = len(x1)
+
+            ## Remove Pins which no longer exist
+            if len(items) > count:
+                canvas.delete(*items[count:])
+                del items[count:]
+
+            ## Move the remaining Pins if they have changed position
+            if previous is None or previous.sides[side] != sidelayout:
+                old = previous.sides[side] if previous is not None else None
+                for (i, item) in enumerate(items):
+                    coords = (x1[i], y1[i], x2[i], y2[i])
+                    if old is None or coords != (old.x1[i], old.y1[i], old.x2[i], old.y2[i]):
+                        canvas.coords(item, *coords)
+
+            ## Add new Pins (hidden if the side is currently drawn as a band)
+            state = 'hidden' if side in self.bands else 'normal'
+            for i in range(len(items), count):
+                items.append(canvas.create_line(x1[i], y1[i], x2[i], y2[i], width=LINETHICKNESS, tags=['pin', side.value, str(i), getpiniid(side, i), PARTTAG], fill=fill(side, i), state=state))
+
+        self.layout = layout
+        self.updatebands()
+
+    def updatebands(self):
+        """ Replaces sides which are too dense to see with bands (and restores them once they are not) """
+        if self.layout is None: return
+        canvas = self.canvas
+        for (side, sidelayout) in self.layout.sides.items():
+            rect = getband(sidelayout)
+            band = self.bands.get(side)
+            if rect is not None:
+                if band is None:
+                    self.bands[side] = canvas.create_rectangle(*rect, fill=BANDCOLOR, outline='', tags=[PARTTAG, 'band'])
+                    canvas.itemconfig(side.value, state='hidden')
+                elif rect != self.bandrects[side]:
+                    canvas.coords(band, *rect)
+                self.bandrects[side] = rect
+            elif band is not None:
+                canvas.delete(band)
+                del self.bands[side]
+                del self.bandrects[side]
+                canvas.itemconfig(side.value, state='normal')
+
+    def scale(self, factor: float, x: Coordinate, y: Coordinate, layout: Layout):
+        """ Scales everything drawn about (x, y). layout is the scaled layout (which the items now match) """
+        self.canvas.scale(PARTTAG, x, y, factor, factor)
+        self.layout = layout
+        self.updatebands()
+
+    def move(self, dx: Coordinate, dy: Coordinate, layout: Layout):
+        """ Moves everything drawn by (dx, dy). layout is the moved layout (which the items now match) """
+        self.canvas.move(PARTTAG, dx, dy)
+        ## The bands were moved with everything else
+        for (side, (x1, y1, x2, y2)) in self.bandrects.items():
+            self.bandrects[side] = (x1 + dx, y1 + dy, x2 + dx, y2 + dy)
+        self.layout = layout
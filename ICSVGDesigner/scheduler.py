@@ -0,0 +1,63 @@
+""" Coalesced rendering for ICSVGDesigner
+
+Variable traces fire on every write, so holding down a Spinbox arrow or typing a multi-digit
+value would otherwise redraw once per intermediate value. The RenderScheduler instead marks the
+preview as dirty and renders once when Tk is next idle, optionally no more often than maxfps.
+"""
+import math
+import time
+import typing
+
+class RenderScheduler:
+    def __init__(self, widget, callback: typing.Callable[[], typing.Any], maxfps: typing.Optional[float] = None):
+        """ Schedules callback on widget's event loop
+
+            widget: any tkinter widget (used for after/after_idle/after_cancel)
+            callback: the function which performs the render
+            maxfps: if provided, renders will be spaced at least 1/maxfps seconds apart
+        """
+        self.widget = widget
+        self.callback = callback
+        self.mininterval = 1 / maxfps if maxfps else 0
+        self.pending: typing.Optional[str] = None
+        self.lastrender: typing.Optional[float] = None
+
+        ## Statistics
+        self.requests = 0
+        self.renders = 0
+        self.coalesced = 0
+
+    def request(self, *args):
+        """ Marks the preview as needing a render. Accepts (and ignores) the arguments passed by trace_add and bind """
+        self.requests += 1
+        if self.pending is not None:
+            self.coalesced += 1
+            return
+        delay = 0.0
+        if self.mininterval and self.lastrender is not None:
+            delay = self.mininterval - (time.perf_counter() - self.lastrender)
+        if delay > 0:
+            self.pending = self.widget.after(math.ceil(delay * 1000), self._run)
+        else:
+            self.pending = self.widget.after_idle(self._run)
+
+    def _run(self):
+        self.pending = None
+        self.lastrender = time.perf_counter()
+        self.renders += 1
+        self.callback()
+
+    def flush(self):
+        """ Immediately performs a pending render (if there is one) """
+        if self.pending is None: return
+        self.widget.after_cancel(self.pending)
+        self._run()
+
+    def cancel(self):
+        """ Drops a pending render without performing it """
+        if self.pending is None: return
+        self.widget.after_cancel(self.pending)
+        self.pending = None
+
+    def stats(self)-> dict[str, int]:
+        return {"requests": self.requests, "renders": self.renders, "coalesced": self.coalesced}
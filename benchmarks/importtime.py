@@ -0,0 +1,76 @@
+""" Import-time budget for ICSVGDesigner's headless modules
+
+Each module is imported in a fresh interpreter using `python -X importtime` and its cumulative
+import time is compared against its budget. The check fails if any module is over budget or if
+any headless module imports tkinter.
+
+    python benchmarks/importtime.py [--repeat N] [--json OUTPUT]
+
+Exits with 1 if the check fails.
+"""
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+## Cumulative import time budgets in milliseconds (including the stdlib modules each one needs)
+BUDGETS: dict[str, float] = {
+    'ICSVGDesigner': 5,
+    'ICSVGDesigner.common': 30,
+    'ICSVGDesigner.geometry': 30,
+    'ICSVGDesigner.model': 30,
+    'ICSVGDesigner.export': 45,
+    'ICSVGDesigner.parts': 45,
+    'ICSVGDesigner.project': 45,
+    'ICSVGDesigner.history': 30,
+    'ICSVGDesigner.hittest': 30,
+    'ICSVGDesigner.instrument': 30,
+    'ICSVGDesigner.batch': 60,
+}
+
+def measure(module: str)-> tuple[float, list[str]]:
+    """ Returns the cumulative import time (ms) of the module and every module it imported """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    imported: list[str] = []
+    cumulative = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line: continue
+        ## Lines are formatted as "import time: self | cumulative | name"
+        (_, cumulativeus, name) = [part.strip() for part in line[len('import time:'):].split('|')]
+        imported.append(name)
+        if name == module:
+            cumulative = int(cumulativeus) / 1000
+    return cumulative, imported
+
+def main(argv = None)-> int:
+    parser = argparse.ArgumentParser(description="Check the import-time budget of ICSVGDesigner's headless modules")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of times to import each module (the fastest is used)")
+    parser.add_argument('--json', type=pathlib.Path, default=None, help="Write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    failed = False
+    for (module, budget) in BUDGETS.items():
+        timings = []
+        imported: list[str] = []
+        for _ in range(args.repeat):
+            (timing, imported) = measure(module)
+            timings.append(timing)
+        best = min(timings)
+        tkinter = [name for name in imported if name == 'tkinter' or name.startswith('tkinter.') or name == '_tkinter']
+        ok = best <= budget and not tkinter
+        failed = failed or not ok
+        results[module] = {"ms": best, "budget": budget, "tkinter": bool(tkinter), "ok": ok}
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<25} {best:7.2f}ms (budget {budget}ms){' imports tkinter' if tkinter else ''}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=4)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
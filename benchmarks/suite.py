@@ -0,0 +1,166 @@
+""" Benchmarks for the ICSVGDesigner GUI
+
+Times ICSVGDesigner.draw() and sortTree() with 10, 100 and 1000 pins per side, growing and
+shrinking the number of pins, export() (to a temporary directory, without any dialogs), and
+importing the package and starting the window.
+
+The GUI needs a display; on a headless machine run the suite under Xvfb:
+
+    xvfb-run -a python benchmarks/suite.py [--repeat N] [--sizes 10 100 1000] [--virtual-table]
+                                           [--json OUTPUT] [--compare BASELINE]
+
+Results are printed and (with --json) saved so that later runs can be compared against them
+with --compare.
+"""
+import argparse
+import json
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from importtime import measure  ## benchmarks/importtime.py
+
+Timings = dict[str, float]
+Results = dict[str, dict[str, Timings]]
+
+def summarize(samples: list[float])-> Timings:
+    """ Returns the fastest and median times in milliseconds """
+    return {"min": min(samples) * 1000, "median": statistics.median(samples) * 1000, "runs": len(samples)}
+
+def setcounts(app, count: int, width: typing.Optional[int] = None):
+    """ Sets the spinboxes without drawing (the benchmark calls draw() itself) """
+    from ICSVGDesigner.common import Side
+    for side in Side.__members__.values():
+        getattr(app, side.value + '_pins').set(count)
+    if width is not None:
+        app.width.set(width)
+    app.scheduler.cancel()
+
+def timedraw(app)-> float:
+    """ Times draw() including the idle tasks (Tk's own redraw) it causes """
+    start = time.perf_counter()
+    app.draw()
+    app.update_idletasks()
+    return time.perf_counter() - start
+
+def benchmarksize(app, size: int, repeat: int, outputdir: pathlib.Path)-> dict[str, Timings]:
+    results: dict[str, list[float]] = {"draw.initial": [], "draw.unchanged": [], "draw.resize": [],
+                                       "draw.grow": [], "draw.shrink": [], "sortTree": [], "export": []}
+    for _ in range(repeat):
+        ## Start each run from an empty part
+        setcounts(app, 0, width=100)
+        app.draw()
+
+        setcounts(app, size)
+        results["draw.initial"].append(timedraw(app))
+        results["draw.unchanged"].append(timedraw(app))
+
+        ## Changing the width moves every pin without adding or removing any
+        setcounts(app, size, width=200)
+        results["draw.resize"].append(timedraw(app))
+
+        setcounts(app, size * 2)
+        results["draw.grow"].append(timedraw(app))
+        setcounts(app, size)
+        results["draw.shrink"].append(timedraw(app))
+
+        start = time.perf_counter()
+        app.sortTree()
+        results["sortTree"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        app.export(str(outputdir / f"benchmark{size}.svg"))
+        results["export"].append(time.perf_counter() - start)
+    return {name: summarize(samples) for (name, samples) in results.items()}
+
+def benchmarkgui(sizes: list[int], repeat: int, virtualtable: bool)-> Results:
+    from ICSVGDesigner.gui import ICSVGDesigner
+    results: Results = {}
+    app = ICSVGDesigner(virtualtable=virtualtable)
+    try:
+        app.update()
+        with tempfile.TemporaryDirectory() as outputdir:
+            for size in sizes:
+                for (name, timings) in benchmarksize(app, size, repeat, pathlib.Path(outputdir)).items():
+                    results.setdefault(name, {})[str(size)] = timings
+    finally:
+        app.destroy()
+    return results
+
+STARTUPSCRIPT = """
+import time
+start = time.perf_counter()
+from ICSVGDesigner.gui import ICSVGDesigner
+imported = time.perf_counter()
+app = ICSVGDesigner()
+app.update()
+shown = time.perf_counter()
+app.destroy()
+print(imported - start, shown - start)
+"""
+
+def benchmarkstartup(repeat: int)-> Results:
+    """ Times importing the package and opening the window, each in a new interpreter """
+    rootimport: list[float] = []
+    guiimport: list[float] = []
+    window: list[float] = []
+    process: list[float] = []
+    for _ in range(repeat):
+        rootimport.append(measure('ICSVGDesigner')[0] / 1000)
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', STARTUPSCRIPT], cwd=ROOT, capture_output=True, text=True, check=True)
+        process.append(time.perf_counter() - start)
+        (imported, shown) = [float(value) for value in result.stdout.split()]
+        guiimport.append(imported)
+        window.append(shown)
+    return {"import.package": {"-": summarize(rootimport)}, "import.gui": {"-": summarize(guiimport)},
+            "startup.window": {"-": summarize(window)}, "startup.process": {"-": summarize(process)}}
+
+def compare(results: Results, baseline: Results):
+    print("\nCompared to baseline (median):")
+    for (name, sizes) in results.items():
+        for (size, timings) in sizes.items():
+            old = baseline.get(name, {}).get(size)
+            if not old or not old.get("median"): continue
+            change = (timings["median"] - old["median"]) / old["median"] * 100
+            print(f"  {name:<18} {size:>5} {old['median']:10.2f}ms -> {timings['median']:10.2f}ms ({change:+.1f}%)")
+
+def main(argv = None)-> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ICSVGDesigner GUI (requires a display, e.g. xvfb-run)")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of times to run each benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help="Pins per side to benchmark")
+    parser.add_argument('--virtual-table', action='store_true', help="Benchmark the virtual pin table")
+    parser.add_argument('--json', type=pathlib.Path, default=None, help="Write the results to this file")
+    parser.add_argument('--compare', type=pathlib.Path, default=None, help="Compare the results with an earlier --json output")
+    args = parser.parse_args(argv)
+
+    results: Results = {}
+    results.update(benchmarkstartup(args.repeat))
+    results.update(benchmarkgui(args.sizes, args.repeat, args.virtual_table))
+
+    for (name, sizes) in results.items():
+        for (size, timings) in sizes.items():
+            print(f"{name:<18} {size:>5} min {timings['min']:10.2f}ms  median {timings['median']:10.2f}ms")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(results, json.load(f)["results"])
+
+    if args.json:
+        import tkinter
+        meta = {"python": platform.python_version(), "tk": tkinter.TkVersion, "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": args.repeat, "virtualtable": args.virtual_table}
+        with open(args.json, 'w') as f:
+            json.dump({"meta": meta, "results": results}, f, indent=4)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+""" The streamed SVG and Pin Locations writers produce the same files as the original ElementTree exporter """
+import pathlib
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from ICSVGDesigner.common import PINLENGTH, Side
+from ICSVGDesigner.export import exportlibrary, exportpart
+from ICSVGDesigner.model import PinStore
+
+def baselineexport(store: PinStore, svgpath: pathlib.Path, txtpath: pathlib.Path):
+    """ The original ICSVGDesigner.export(), reading the design from the store instead of the GUI """
+    width = store.width
+    height = store.height
+    overallwidth = width + 2 * PINLENGTH
+    overallheight = height + 2 * PINLENGTH
+
+    root = ET.Element('svg', xmlns='http://www.w3.org/2000/svg', version='1.1', width=str(overallwidth), height=str(overallheight), viewBox=f"0 0 {overallwidth} {overallheight}")
+    ET.SubElement(root, 'rect', x=str(PINLENGTH), y=str(PINLENGTH), width=str(width), height=str(height), stroke="black", fill="none", **{"stroke-width":"1"})
+
+    pinlocations0 = ["Pin Locations from Top-Left:"]
+    pinlocationscenter = ["Pin Locations from Center:"]
+    for side in Side.__members__.values():
+        pinlocations0.append(f"\t{side.name} Pins:")
+        pinlocationscenter.append(f"\t{side.name} Pins:")
+        pins = store.count(side)
+        if side in [Side.Top, Side.Bottom]:
+            spacing = width / (pins + 1)
+        else:
+            spacing = height / (pins + 1)
+        for pin in store.sides[side]:
+            if pin.suppressed: continue
+            if side == Side.Top:
+                (x, y, deltax, deltay) = (PINLENGTH + spacing * (pin.id + 1), 0, 0, PINLENGTH)
+            elif side == Side.Bottom:
+                (x, y, deltax, deltay) = (PINLENGTH + spacing * (pin.id + 1), overallheight - PINLENGTH, 0, PINLENGTH)
+            elif side == Side.Left:
+                (x, y, deltax, deltay) = (0, PINLENGTH + spacing * (pin.id + 1), PINLENGTH, 0)
+            else:
+                (x, y, deltax, deltay) = (overallwidth, PINLENGTH + spacing * (pin.id + 1), -PINLENGTH, 0)
+
+            name = pin.name
+            namestring = ""
+            if name: namestring= f" ({name})"
+            else: name = f"{side.name} Pin {pin.id + 1}"
+            pinnumber = pin.number
+            if not pinnumber:
+                pinnumber = pin.id + 1
+                pinnumberstring = f"{side.name} Pin {pinnumber}"
+            else:
+                pinnumberstring = f"Pin {pinnumber}"
+            pinlocations0.append(f"\t\t{pinnumberstring}{namestring}: ({x}, {y})")
+            pinlocationscenter.append(f"\t\t{pinnumberstring}{namestring}: ({x - overallwidth / 2}, {y - overallheight / 2})")
+
+            ET.SubElement(root, 'line', id=f"{name}", x1=str(x), y1=str(y), x2=str(x + deltax), y2=str(y + deltay), stroke="black", **{"stroke-width":"1"})
+
+    tree = ET.ElementTree(root)
+    with open(svgpath, 'wb') as f:
+        f.write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+        tree.write(f)
+
+    with open(txtpath, 'w') as f:
+        f.write("\n".join(pinlocations0))
+        f.write("\n\n")
+        f.write("\n".join(pinlocationscenter))
+
+def makestore(width: int, height: int, counts: dict[Side, int])-> PinStore:
+    store = PinStore(width, height)
+    for (side, count) in counts.items():
+        store.resize(side, count)
+    return store
+
+def detailedstore()-> PinStore:
+    """ A design with uneven spacing, suppressed pins, pin numbers and names which need escaping """
+    store = makestore(137, 101, {Side.Top: 3, Side.Bottom: 7, Side.Left: 5, Side.Right: 0})
+    store.setname(Side.Left, 0, 'A & B <"quoted">')
+    store.setname(Side.Left, 1, "Ωmega\tTab")
+    store.setnumber(Side.Left, 1, 12)
+    store.setnumber(Side.Bottom, 6, 3)
+    store.setsuppressed(Side.Top, 1, True)
+    store.setsuppressed(Side.Left, 4, True)
+    return store
+
+STORES = {
+    'default': lambda: makestore(100, 100, {}),
+    'even': lambda: makestore(100, 100, {side: 4 for side in Side.__members__.values()}),
+    'detailed': detailedstore,
+    'large': lambda: makestore(1000, 700, {side: 250 for side in Side.__members__.values()}),
+}
+
+@pytest.mark.parametrize('name', list(STORES))
+def test_matches_baseline(tmp_path: pathlib.Path, name: str):
+    store = STORES[name]()
+    baselineexport(store, tmp_path / 'baseline.svg', tmp_path / 'baseline.txt')
+    (svgpath, txtpath) = exportpart(store, tmp_path / 'part.svg')
+    assert svgpath.read_bytes() == (tmp_path / 'baseline.svg').read_bytes()
+    assert txtpath.read_bytes() == (tmp_path / 'baseline.txt').read_bytes()
+
+def test_library_symbols_match_parts(tmp_path: pathlib.Path):
+    """ Each symbol of a library has the same elements as the part's own SVG (with prefixed ids) """
+    stores = {name: STORES[name]() for name in ('even', 'detailed')}
+    (svgpath, txtpath) = exportlibrary(stores.items(), tmp_path / 'library.svg')
+    library = ET.parse(svgpath).getroot()
+    namespace = {'svg': 'http://www.w3.org/2000/svg'}
+    for (name, store) in stores.items():
+        (partpath, _) = exportpart(store, tmp_path / f'{name}.svg')
+        part = ET.parse(partpath).getroot()
+        symbol = library.find(f"svg:symbol[@id='{name}']", namespace)
+        assert symbol is not None
+        for element in part:
+            if 'id' in element.attrib: element.set('id', f"{name}-{element.get('id')}")
+        assert [(element.tag, element.attrib) for element in symbol] == [(element.tag, element.attrib) for element in part]
+    assert txtpath.read_text().startswith("even:\nPin Locations from Top-Left:")
@@ -0,0 +1,119 @@
+from ICSVGDesigner.common import Side
+from ICSVGDesigner.history import CHUNKSIZE, History
+from ICSVGDesigner.model import PinStore
+
+def namedstore(count: int)-> PinStore:
+    """ A store with count Left pins, each with its own name and pin number """
+    store = PinStore()
+    store.resize(Side.Left, count)
+    for pinid in range(count):
+        store.setname(Side.Left, pinid, f"P{pinid}")
+        store.setnumber(Side.Left, pinid, pinid + 1)
+    return store
+
+def pinstates(store: PinStore, side: Side = Side.Left):
+    return [(pin.name, pin.number, pin.suppressed) for pin in store.sides[side]]
+
+def test_undo_shrink_restores_pins():
+    ## More than one chunk, with the shrink ending part way through a chunk
+    count = CHUNKSIZE * 2 + 5
+    store = namedstore(count)
+    history = History(store)
+    before = pinstates(store)
+
+    store.resize(Side.Left, 10)
+    history.checkpoint()
+    assert store.count(Side.Left) == 10
+
+    result = history.undo()
+    assert result is not None
+    assert len(result.added) == count - 10
+    assert pinstates(store) == before
+    assert store.getnumberpins(count) == [store.getpin(Side.Left, count - 1)]
+
+def test_regrow_after_shrink_uses_default_pins():
+    store = namedstore(20)
+    history = History(store)
+    store.resize(Side.Left, 5)
+    history.checkpoint()
+    store.resize(Side.Left, 20)
+    history.checkpoint()
+    ## Pins added by growing a side are new pins, not the ones which were removed
+    assert store.getpin(Side.Left, 10).name == "Left Pin 11"
+    assert store.getpin(Side.Left, 10).number is None
+
+    history.undo()
+    assert store.count(Side.Left) == 5
+    history.undo()
+    assert pinstates(store) == pinstates(namedstore(20))
+
+def test_redo_after_undo():
+    store = namedstore(20)
+    history = History(store)
+    store.resize(Side.Left, 5)
+    history.checkpoint()
+    store.resize(Side.Left, 20)
+    history.checkpoint()
+    regrown = pinstates(store)
+
+    history.undo()
+    history.undo()
+    history.redo()
+    assert store.count(Side.Left) == 5
+    history.redo()
+    assert pinstates(store) == regrown
+    assert history.redo() is None
+
+def test_edit_clears_redo():
+    store = namedstore(5)
+    history = History(store)
+    store.setname(Side.Left, 0, "A")
+    history.checkpoint()
+    history.undo()
+    store.setname(Side.Left, 1, "B")
+    history.checkpoint()
+    assert history.redo() is None
+    assert store.getpin(Side.Left, 0).name == "P0"
+
+def test_undo_includes_uncommitted_edits():
+    store = namedstore(5)
+    history = History(store)
+    store.setsuppressed(Side.Left, 2, True)
+    history.undo()
+    assert not store.getpin(Side.Left, 2).suppressed
+
+def test_undo_restores_duplicate_numbers():
+    store = namedstore(5)
+    history = History(store)
+    store.setnumber(Side.Left, 4, 1)
+    history.checkpoint()
+    assert store.hasduplicates()
+    history.undo()
+    assert not store.hasduplicates()
+    assert store.getpin(Side.Left, 4).number == 5
+
+def test_depth():
+    store = namedstore(5)
+    history = History(store, depth=2)
+    for name in "ABC":
+        store.setname(Side.Left, 0, name)
+        history.checkpoint()
+    assert history.undo() is not None
+    assert history.undo() is not None
+    assert history.undo() is None
+    assert store.getpin(Side.Left, 0).name == "A"
+
+def test_memory_limit_counts_redo_steps():
+    store = namedstore(CHUNKSIZE * 4)
+    history = History(store, memorylimit=1)
+    for pinid in range(0, CHUNKSIZE * 4, CHUNKSIZE):
+        store.setname(Side.Left, pinid, "Changed")
+        history.checkpoint()
+    ## Only the most recent step is kept
+    assert len(history.undostack) == 1
+    history.undo()
+    assert (len(history.undostack), len(history.redostack)) == (0, 1)
+    assert history.memory == sum(cost for (_, cost) in history.redostack)
+    history.redo()
+    assert (len(history.undostack), len(history.redostack)) == (1, 0)
+    assert history.memory == sum(cost for (_, cost) in history.undostack)
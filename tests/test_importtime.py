@@ -0,0 +1,30 @@
+""" The headless modules' import-time budget (see benchmarks/importtime.py) """
+import compileall
+import subprocess
+import sys
+
+import pytest
+
+import importtime
+
+## The modules the batch workers import, none of which may import tkinter
+HEADLESSMODULES = ['ICSVGDesigner', 'ICSVGDesigner.model', 'ICSVGDesigner.export', 'ICSVGDesigner.batch', 'ICSVGDesigner.parts']
+## Imports are timed more than once and the fastest is used, the same as importtime.main() (but more
+## times, so that a busy machine doesn't fail the test)
+REPEAT = 10
+
+@pytest.fixture(scope='module', autouse=True)
+def compiled():
+    """ The budgets are for compiled modules, which may not have been written yet (e.g.- with PYTHONDONTWRITEBYTECODE) """
+    compileall.compile_dir(importtime.ROOT / 'ICSVGDesigner', quiet=1)
+
+@pytest.mark.parametrize('module', list(importtime.BUDGETS))
+def test_budget(module: str):
+    best = min(importtime.measure(module)[0] for _ in range(REPEAT))
+    assert best <= importtime.BUDGETS[module], f"{module} took {best:.2f}ms to import"
+
+@pytest.mark.parametrize('module', HEADLESSMODULES)
+def test_no_tkinter(module: str):
+    check = f"import sys, {module}; print([name for name in sys.modules if name.split('.')[0] in ('tkinter', '_tkinter')])"
+    result = subprocess.run([sys.executable, '-c', check], cwd=importtime.ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,90 @@
+import pytest
+
+from ICSVGDesigner.common import Side
+from ICSVGDesigner.model import MAXPINS, PinStore
+from ICSVGDesigner.parts import PartDefinitionError, PinAssignment, applypintable, parsepintable
+
+def test_rows_without_header():
+    assignments = parsepintable("1,OUT,left\n2,IN,left\n8,VCC,right,x\n")
+    assert assignments == [PinAssignment(1, Side.Left, 0, "OUT", 1, None),
+                           PinAssignment(2, Side.Left, 1, "IN", 2, None),
+                           PinAssignment(3, Side.Right, 0, "VCC", 8, True)]
+
+def test_header_in_any_order_with_aliases():
+    text = "Signal\tDescription\tPin #\tSide\nOUT\tOutput\t1\tleft\nVCC\tSupply\t8\tright\n"
+    assignments = parsepintable(text)
+    assert [(a.line, a.side, a.name, a.number) for a in assignments] == [(2, Side.Left, "OUT", 1), (3, Side.Right, "VCC", 8)]
+
+def test_first_row_of_pin_names_is_not_a_header():
+    ## NO and NC are also header aliases, but a row with a pin number in it is data
+    assignments = parsepintable("1,NO,left\n2,NC,left\n")
+    assert [a.name for a in assignments] == ["NO", "NC"]
+
+def test_ids_continue_after_an_explicit_id():
+    assignments = parsepintable("side,id,name\nleft,3,A\nleft,,B\ntop,,C\n")
+    assert [(a.side, a.id) for a in assignments] == [(Side.Left, 3), (Side.Left, 4), (Side.Top, 0)]
+
+@pytest.mark.parametrize('text, message', [
+    ("", "The Pin Table is empty"),
+    (" \n\n", "The Pin Table is empty"),
+    ("NO,NC,COM\n", "The Pin Table has no rows"),
+    ("number,name\n,OUT\n", "Line 2: a side or a pin number is required"),
+    ("number,name,id\n4,OUT,3\n", "Line 2: a pin id requires a side"),
+    ("side,id\nleft,-1\n", "Line 2: pin ids cannot be negative"),
+    (f"side,id\nleft,{MAXPINS}\n", f"Line 2: a side cannot have more than {MAXPINS} pins"),
+    ("number,name,side\nA,OUT,left\n", "Line 2: number must be an integer"),
+    ("-3,OUT,left\n", "Line 1: pin numbers must be at least 1"),
+    ("0,OUT,left\n", "Line 1: pin numbers must be at least 1"),
+    ("1,OUT,middle\n", "Line 1: invalid side"),
+])
+def test_invalid_tables(text: str, message: str):
+    with pytest.raises(PartDefinitionError, match=f"^{message}"):
+        parsepintable(text)
+
+def test_apply_extends_sides_and_assigns_pins():
+    store = PinStore()
+    store.resize(Side.Left, 2)
+    result = applypintable(store, parsepintable("1,OUT,left\n2,IN,left\n3,GND,left\n"))
+    assert store.count(Side.Left) == 3
+    assert result.added == [store.getpin(Side.Left, 2)]
+    assert [(pin.name, pin.number) for pin in store.sides[Side.Left]] == [("OUT", 1), ("IN", 2), ("GND", 3)]
+
+def test_apply_rows_without_a_side_match_pin_numbers():
+    store = PinStore()
+    store.resize(Side.Left, 2)
+    store.setnumber(Side.Left, 1, 7)
+    applypintable(store, parsepintable("number,name\n7,EN\n"))
+    assert store.getpin(Side.Left, 1).name == "EN"
+
+def assertrejected(store: PinStore, text: str, message: str):
+    """ The table is rejected without changing the store """
+    before = [(pin.side, pin.id, pin.name, pin.number) for pin in store]
+    with pytest.raises(PartDefinitionError, match=f"^{message}"):
+        applypintable(store, parsepintable(text))
+    assert [(pin.side, pin.id, pin.name, pin.number) for pin in store] == before
+
+def test_apply_rejects_unknown_pin_number():
+    store = PinStore()
+    store.resize(Side.Left, 2)
+    assertrejected(store, "1,A,left\n9,B\n", "Line 2: no pin has pin number 9")
+
+def test_apply_rejects_ambiguous_pin_number():
+    store = PinStore()
+    store.resize(Side.Left, 2)
+    store.setnumber(Side.Left, 0, 4)
+    store.setnumber(Side.Left, 1, 4)
+    assertrejected(store, "4,A\n", "Line 1: more than one pin has pin number 4")
+
+def test_apply_rejects_pin_assigned_twice():
+    store = PinStore()
+    store.resize(Side.Left, 2)
+    store.setnumber(Side.Left, 0, 5)
+    assertrejected(store, "side,id,name,number\nleft,0,A,\n,,B,5\n", "Line 3: Left Pin 1 is already assigned on line 2")
+
+def test_apply_rejects_sides_over_the_pin_limit():
+    store = PinStore()
+    ## parsepintable() rejects these ids itself, so the assignment is made directly
+    assignments = [PinAssignment(2, Side.Left, MAXPINS, None, None, None)]
+    with pytest.raises(PartDefinitionError, match=f"^Line 2: a side cannot have more than {MAXPINS} pins"):
+        applypintable(store, assignments)
+    assert store.count(Side.Left) == 0
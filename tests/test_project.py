@@ -0,0 +1,106 @@
+import json
+import pathlib
+
+import pytest
+
+from ICSVGDesigner.common import Side
+from ICSVGDesigner.model import MAXPINS, PinStore
+from ICSVGDesigner.project import Project, ProjectError, getjournalpath, loadproject
+
+@pytest.fixture
+def projectpath(tmp_path: pathlib.Path)-> pathlib.Path:
+    return tmp_path / 'part.icsvgproj'
+
+def createproject(path: pathlib.Path)-> Project:
+    store = PinStore(120, 80)
+    store.resize(Side.Left, 4)
+    store.setname(Side.Left, 0, "VCC")
+    return Project.create(path, store)
+
+def journallines(path: pathlib.Path)-> list[str]:
+    return getjournalpath(path).read_text(encoding='utf-8').splitlines()
+
+def test_journal_is_replayed(projectpath: pathlib.Path):
+    project = createproject(projectpath)
+    project.store.setname(Side.Left, 1, "GND")
+    project.store.setnumber(Side.Left, 1, 8)
+    project.store.resize(Side.Right, 2)
+    project.store.setsuppressed(Side.Right, 1, True)
+    project.store.setdimensions(150, 90)
+    ## The project is not closed, so the edits are only in the journal
+    assert len(journallines(projectpath)) == 6
+
+    loaded = loadproject(projectpath)
+    assert loaded.edits == 5
+    store = loaded.store
+    assert (store.width, store.height) == (150, 90)
+    assert store.getpin(Side.Left, 0).name == "VCC"
+    assert (store.getpin(Side.Left, 1).name, store.getpin(Side.Left, 1).number) == ("GND", 8)
+    assert store.count(Side.Right) == 2
+    assert store.getpin(Side.Right, 1).suppressed
+
+def test_save_empties_journal(projectpath: pathlib.Path):
+    project = createproject(projectpath)
+    project.store.setname(Side.Left, 1, "GND")
+    project.save()
+    assert len(journallines(projectpath)) == 1
+    loaded = loadproject(projectpath)
+    assert loaded.edits == 0
+    assert loaded.store.getpin(Side.Left, 1).name == "GND"
+
+def test_journal_from_another_generation_is_ignored(projectpath: pathlib.Path):
+    project = createproject(projectpath)
+    project.store.setname(Side.Left, 1, "GND")
+    lines = journallines(projectpath)
+    ## As if the snapshot was rewritten but ICSVGDesigner stopped before the journal was emptied
+    lines[0] = json.dumps({'generation': project.generation - 1})
+    getjournalpath(projectpath).write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+    loaded = loadproject(projectpath)
+    assert loaded.edits == 0
+    assert loaded.store.getpin(Side.Left, 1).name == "Left Pin 2"
+
+def test_torn_last_line_is_ignored(projectpath: pathlib.Path):
+    project = createproject(projectpath)
+    project.store.setname(Side.Left, 1, "GND")
+    project.store.setname(Side.Left, 2, "OUT")
+    lines = journallines(projectpath)
+    ## The last edit was only partially written
+    lines[-1] = lines[-1][:len(lines[-1]) // 2]
+    getjournalpath(projectpath).write_text("\n".join(lines), encoding='utf-8')
+
+    loaded = loadproject(projectpath)
+    assert loaded.edits == 1
+    assert loaded.store.getpin(Side.Left, 1).name == "GND"
+    assert loaded.store.getpin(Side.Left, 2).name == "Left Pin 3"
+
+def test_damaged_edit_before_the_end_is_an_error(projectpath: pathlib.Path):
+    project = createproject(projectpath)
+    project.store.setname(Side.Left, 1, "GND")
+    project.store.setname(Side.Left, 2, "OUT")
+    lines = journallines(projectpath)
+    lines[1] = lines[1][:5]
+    getjournalpath(projectpath).write_text("\n".join(lines) + "\n", encoding='utf-8')
+    with pytest.raises(ProjectError):
+        loadproject(projectpath)
+
+def test_resize_over_the_pin_limit_is_an_error(projectpath: pathlib.Path):
+    createproject(projectpath)
+    with open(getjournalpath(projectpath), 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'op': 'resize', 'side': 'left', 'id': None, 'value': MAXPINS + 1}) + "\n")
+    with pytest.raises(ProjectError):
+        loadproject(projectpath)
+
+def test_attach_folds_journal_into_snapshot(projectpath: pathlib.Path):
+    project = createproject(projectpath)
+    project.store.setname(Side.Left, 1, "GND")
+
+    store = PinStore()
+    reopened = Project.attach(projectpath, store, loadproject(projectpath))
+    assert reopened.generation == project.generation + 1
+    assert len(journallines(projectpath)) == 1
+    assert store.getpin(Side.Left, 1).name == "GND"
+    ## Edits made after attaching are journaled
+    store.setname(Side.Left, 2, "OUT")
+    assert loadproject(projectpath).store.getpin(Side.Left, 2).name == "OUT"
+    reopened.close()